@@ -0,0 +1,129 @@
+import json
+import os
+import re
+import numpy as np
+
+HEADER_FILE = "header.json"
+
+
+class ColumnarCheckpoint:
+    """
+    Append-only columnar store for simulation state.
+
+    The directory holds a small JSON header with the running totals, the column
+    names and the id and row count of every chunk, plus one .npy file per column
+    per chunk. Resuming reads only the header; history rows are loaded lazily by
+    range through memory-mapped chunk files.
+
+    Each append merges the new rows with the trailing chunks that are no larger
+    than the merged tail, so chunk sizes at least double towards the start of
+    the history: a checkpoint of n rows keeps O(log n) chunks and every row is
+    rewritten O(log n) times.
+
+    Chunk files are written before the header, and the header is replaced
+    atomically, so an interrupted append never corrupts the checkpoint. Chunk
+    files the header no longer references are removed after the header is
+    written, and on load in case an earlier run was interrupted in between.
+    """
+
+    def __init__(self, directory, columns, dtype=np.int64):
+        self.directory = directory
+        self.columns = list(columns)
+        self.dtype = np.dtype(dtype)
+        self.totals = {}
+        self.chunk_rows = []
+        self.chunk_ids = []
+        self.next_chunk = 0
+
+        header_path = os.path.join(directory, HEADER_FILE)
+        if os.path.exists(header_path):
+            with open(header_path) as file:
+                header = json.load(file)
+            if header["columns"] != self.columns:
+                raise ValueError(f"Checkpoint columns {header['columns']} do not match {self.columns}")
+            self.totals = header["totals"]
+            self.chunk_rows = header["chunk_rows"]
+            # Headers written before compaction numbered chunks by position
+            self.chunk_ids = header.get("chunk_ids", list(range(len(self.chunk_rows))))
+            self.next_chunk = header.get("next_chunk", len(self.chunk_rows))
+            self._remove_stale_chunks()
+
+    def exists(self):
+        return bool(self.chunk_rows) or bool(self.totals)
+
+    @property
+    def num_rows(self):
+        return sum(self.chunk_rows)
+
+    def _chunk_path(self, column, chunk):
+        return os.path.join(self.directory, f"{column}_{chunk:06d}.npy")
+
+    def _write_header(self):
+        header = {"columns": self.columns, "totals": self.totals, "chunk_rows": self.chunk_rows,
+                  "chunk_ids": self.chunk_ids, "next_chunk": self.next_chunk}
+        tmp_path = os.path.join(self.directory, HEADER_FILE + ".tmp")
+        with open(tmp_path, "w") as file:
+            json.dump(header, file, indent=2)
+        os.replace(tmp_path, os.path.join(self.directory, HEADER_FILE))
+
+    def _remove_stale_chunks(self):
+        live = set(self.chunk_ids)
+        pattern = re.compile(r"(.+)_(\d{6})\.npy")
+        for name in os.listdir(self.directory):
+            match = pattern.fullmatch(name)
+            if match and match.group(1) in self.columns and int(match.group(2)) not in live:
+                os.remove(os.path.join(self.directory, name))
+
+    def append(self, rows, totals):
+        """Append rows (sequence of rows or 2D array, one column per name) and save new totals."""
+        rows = np.asarray(rows, dtype=self.dtype).reshape(-1, len(self.columns))
+        os.makedirs(self.directory, exist_ok=True)
+
+        merged = 0
+        if len(rows):
+            tail_rows = len(rows)
+            while merged < len(self.chunk_rows) and self.chunk_rows[-merged - 1] <= tail_rows:
+                merged += 1
+                tail_rows += self.chunk_rows[-merged]
+            keep = len(self.chunk_rows) - merged
+            tail_ids = self.chunk_ids[keep:]
+
+            chunk = self.next_chunk
+            for j, column in enumerate(self.columns):
+                parts = [np.load(self._chunk_path(column, old)) for old in tail_ids]
+                np.save(self._chunk_path(column, chunk), np.concatenate(parts + [rows[:, j]]))
+            self.chunk_rows = self.chunk_rows[:keep] + [tail_rows]
+            self.chunk_ids = self.chunk_ids[:keep] + [chunk]
+            self.next_chunk += 1
+
+        self.totals = {key: value.item() if isinstance(value, np.generic) else value
+                       for key, value in totals.items()}
+        self._write_header()
+        if merged:
+            self._remove_stale_chunks()
+
+    def read(self, start=0, stop=None, columns=None):
+        """Return {column: array} for history rows start..stop-1, touching only the chunks needed."""
+        columns = self.columns if columns is None else columns
+        total = self.num_rows
+        start, stop, _ = slice(start, stop).indices(total)
+        result = {column: [] for column in columns}
+
+        offset = 0
+        for chunk, n in zip(self.chunk_ids, self.chunk_rows):
+            lo, hi = max(start, offset), min(stop, offset + n)
+            if lo < hi:
+                for column in columns:
+                    data = np.load(self._chunk_path(column, chunk), mmap_mode="r")
+                    result[column].append(np.array(data[lo - offset:hi - offset]))
+            offset += n
+            if offset >= stop:
+                break
+
+        return {column: np.concatenate(parts) if parts else np.empty(0, dtype=self.dtype)
+                for column, parts in result.items()}
+
+    def read_rows(self, start=0, stop=None):
+        """Same as read() but as a list of rows, e.g. for tabulate."""
+        data = self.read(start, stop)
+        return np.column_stack([data[column] for column in self.columns]).tolist()
@@ -0,0 +1,64 @@
+import numpy as np
+
+
+class DiscreteDistribution:
+    """
+    Sampler for a discrete empirical distribution given as (value, probability) pairs.
+
+    sample() draws with the Walker/Vose alias method: one uniform integer and one
+    uniform real per draw, O(1) per value and fully vectorized.
+    from_uniforms() maps given uniforms through the inverse CDF with
+    np.searchsorted, for replaying a fixed stream of random numbers.
+    """
+
+    def __init__(self, table):
+        values, probabilities = zip(*table)
+        self.values = np.asarray(values)
+        self.probabilities = np.asarray(probabilities, dtype=float)
+        if np.any(self.probabilities < 0):
+            raise ValueError("Probabilities must be non-negative")
+        if not np.isclose(self.probabilities.sum(), 1.0):
+            raise ValueError(f"Probabilities sum to {self.probabilities.sum()}, not 1")
+
+        # Rounding removes float noise such as 0.1 + 0.14 = 0.24000000000000002, so
+        # a uniform built from random digits lands in the bin the table intends
+        self.cdf = np.round(np.cumsum(self.probabilities), 12)
+        self.cdf[-1] = 1.0
+        self.alias_prob, self.alias = self._build_alias_table(self.probabilities / self.probabilities.sum())
+
+    @staticmethod
+    def _build_alias_table(probabilities):
+        # Vose's alias method: pair every under-full column with an over-full one
+        n = len(probabilities)
+        scaled = probabilities * n
+        alias_prob = np.ones(n)
+        alias = np.arange(n)
+
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            alias_prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is full up to rounding error
+        for i in small + large:
+            alias_prob[i] = 1.0
+
+        return alias_prob, alias
+
+    def sample(self, size=None, rng=None):
+        """Draw `size` values with the alias method."""
+        rng = rng if rng is not None else np.random.default_rng()
+        column = rng.integers(0, len(self.values), size=size)
+        keep = rng.random(size=size) < self.alias_prob[column]
+        return self.values[np.where(keep, column, self.alias[column])]
+
+    def from_uniforms(self, uniforms):
+        """Map uniforms in [0, 1) to values through the inverse CDF."""
+        index = np.searchsorted(self.cdf, uniforms, side='right')
+        return self.values[np.minimum(index, len(self.values) - 1)]
+
+    def mean(self):
+        return float(np.dot(self.values, self.probabilities))
@@ -0,0 +1,130 @@
+import numpy as np
+
+GAUSSIAN_CUT = 4.0  # Kernel is truncated at this many bandwidths
+
+
+def silverman_bandwidth(n, std, iqr):
+    """Silverman's rule of thumb: 0.9 * min(std, IQR / 1.34) * n^(-1/5)."""
+    spread = min(std, iqr / 1.34) if iqr > 0 else std
+    return 0.9 * spread * n ** (-0.2)
+
+
+def scott_bandwidth(n, std):
+    """
+    Scott's factor n^(-1/5) times std, as in scipy.stats.gaussian_kde and seaborn's kdeplot.
+
+    This is not the Gaussian-reference (normal scale) rule 1.059 * std * n^(-1/5),
+    which gives a 6% wider kernel.
+    """
+    return std * n ** (-0.2)
+
+
+def linear_bin(data, grid_min, grid_max, grid_size):
+    """
+    Spread every point over its two neighbouring grid nodes in proportion to distance.
+
+    Points outside [grid_min, grid_max] are dropped. Returns float counts of length grid_size.
+    """
+    data = np.asarray(data, dtype=float).ravel()
+    delta = (grid_max - grid_min) / (grid_size - 1)
+    position = (data - grid_min) / delta
+    position = position[(position >= 0) & (position <= grid_size - 1)]
+
+    left = np.minimum(position.astype(np.int64), grid_size - 2)
+    right_weight = position - left
+    counts = np.bincount(left, weights=1.0 - right_weight, minlength=grid_size)
+    counts += np.bincount(left + 1, weights=right_weight, minlength=grid_size)
+    return counts
+
+
+def convolve_gaussian(counts, delta, bandwidth):
+    """Convolve binned counts with a Gaussian kernel through a zero-padded real FFT."""
+    grid_size = len(counts)
+    half = min(int(np.ceil(GAUSSIAN_CUT * bandwidth / delta)), grid_size - 1)
+    offsets = np.arange(-half, half + 1) * delta
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+
+    size = 1 << int(np.ceil(np.log2(grid_size + 2 * half)))
+    smoothed = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel, size), size)
+    return smoothed[half:half + grid_size]
+
+
+class StreamingKDE:
+    """
+    Kernel density estimate accumulated chunk by chunk on a fixed grid.
+
+    add() bins each chunk linearly onto the grid and updates running moments,
+    so memory is O(grid_size) however many values are streamed in. density()
+    convolves the counts with the kernel in O(g log g). The IQR needed by
+    Silverman's rule is read from the binned counts.
+    """
+
+    def __init__(self, grid_min, grid_max, grid_size=2048):
+        self.grid = np.linspace(grid_min, grid_max, grid_size)
+        self.delta = self.grid[1] - self.grid[0]
+        self.counts = np.zeros(grid_size)
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, data):
+        data = np.asarray(data, dtype=float).ravel()
+        if data.size == 0:
+            return
+        self.counts += linear_bin(data, self.grid[0], self.grid[-1], len(self.grid))
+
+        # Chan et al. parallel update of the mean and sum of squared deviations
+        n_b, mean_b = data.size, data.mean()
+        m2_b = np.sum((data - mean_b) ** 2)
+        total = self.n + n_b
+        shift = mean_b - self.mean
+        self.mean += shift * n_b / total
+        self.m2 += m2_b + shift ** 2 * self.n * n_b / total
+        self.n = total
+
+    def std(self):
+        return np.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def iqr(self):
+        cdf = np.cumsum(self.counts)
+        q25, q75 = np.interp([0.25 * cdf[-1], 0.75 * cdf[-1]], cdf, self.grid)
+        return q75 - q25
+
+    def bandwidth(self, rule='silverman'):
+        if rule == 'silverman':
+            return silverman_bandwidth(self.n, self.std(), self.iqr())
+        if rule == 'scott':
+            return scott_bandwidth(self.n, self.std())
+        return float(rule)
+
+    def density(self, bandwidth='silverman'):
+        """Return (grid, density); bandwidth is 'silverman', 'scott' or a number."""
+        h = self.bandwidth(bandwidth)
+        if h <= 0:
+            raise ValueError("Bandwidth must be positive; need more than one distinct value")
+        return self.grid, convolve_gaussian(self.counts, self.delta, h) / self.n
+
+
+def fft_kde(data, bandwidth='scott', grid_size=2048, cut=3.0):
+    """
+    Gaussian KDE of `data` in O(n + g log g) time.
+
+    The grid extends `cut` bandwidths past the data range, like seaborn's kdeplot.
+    bandwidth is 'silverman', 'scott' (seaborn's default) or a number.
+
+    Returns:
+        (grid, density)
+    """
+    data = np.asarray(data, dtype=float).ravel()
+    n, std = data.size, data.std(ddof=1)
+    if bandwidth == 'silverman':
+        q25, q75 = np.percentile(data, [25, 75])
+        h = silverman_bandwidth(n, std, q75 - q25)
+    elif bandwidth == 'scott':
+        h = scott_bandwidth(n, std)
+    else:
+        h = float(bandwidth)
+
+    kde = StreamingKDE(data.min() - cut * h, data.max() + cut * h, grid_size)
+    kde.add(data)
+    return kde.density(h)
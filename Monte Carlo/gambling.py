@@ -1,4 +1,5 @@
 import random
+from markov_game import solve_game
 
 def gambling_game_simulation(num_trials):
     print(f"{'Game':<6} {'Sl. No.':<8} {'Random':<8} {'Head or Tail':<12} {'Cumulative Heads':<18} {'Tails':<8} {'Difference':<10}")
@@ -51,8 +52,20 @@ def gambling_game_simulation(num_trials):
     print(f"Net Earnings: BDT. {net_earnings}")
     print("-" * 40)
 
-# Parameters
-num_trials = int(input("Enter the number of games to simulate: "))
+    # Compare against the exact absorbing Markov chain solution
+    exact = solve_game(threshold=3, max_flips=8, p_head=0.5, win_payoff=1, lose_payoff=-1)
+    print(f"Exact Win Probability: {exact['win_probability']:.4f} (simulated {total_wins / num_trials:.4f})")
+    print(f"Exact Expected Earnings: BDT. {exact['expected_earnings'] * num_trials:.2f}")
+    print("-" * 40)
+
+def main():
+    # Parameters
+    num_trials = int(input("Enter the number of games to simulate: "))
+
+    # Run the simulation
+    gambling_game_simulation(num_trials)
+
+
+if __name__ == "__main__":
+    main()
 
-# Run the simulation
-gambling_game_simulation(num_trials)
@@ -0,0 +1,144 @@
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "random numbers"))
+from variates import LCGStream, VariateGenerator
+
+
+def lindley_chunk(inter_arrivals, services, wait_before=0.0, service_before=0.0):
+    """
+    Waiting times of a block of FIFO single-server customers.
+
+    Lindley's recursion W_i = max(0, W_{i-1} + B_{i-1} - A_i) is solved for the
+    whole block at once: with P the cumulative sum of X_i = B_{i-1} - A_i,
+    W_i = P_i - min(-W_0, min_{k<=i} P_k), where W_0 and B_0 are the wait and
+    service time of the last customer of the previous block. Cumulative sums
+    restart every block, so rounding error does not grow with run length.
+    """
+    increments = np.empty(len(inter_arrivals))
+    increments[0] = service_before
+    increments[1:] = services[:-1]
+    increments -= inter_arrivals
+
+    partial = np.cumsum(increments)
+    running_min = np.minimum.accumulate(partial)
+    np.minimum(running_min, -wait_before, out=running_min)
+    return partial - running_min
+
+
+class LindleyQueue:
+    """
+    Headless single-server FIFO queue fed with blocks of inter-arrival and service times.
+
+    State carried between blocks is only the clock, the last wait and the last
+    service time, so blocks can come from a generator, a file or an upstream
+    station. Delay, number in queue and utilization are reduced in the same pass.
+    """
+
+    def __init__(self):
+        self.customers = 0
+        self.arrival_time = 0.0
+        self.last_wait = 0.0
+        self.last_service = 0.0
+        self.total_wait = 0.0
+        self.total_service = 0.0
+        self.max_wait = 0.0
+        self.customers_delayed = 0
+        self.end_time = 0.0
+
+    def process(self, inter_arrivals, services):
+        """Push one block through the queue; returns (arrival_times, waits) of the block."""
+        inter_arrivals = np.asarray(inter_arrivals, dtype=float)
+        services = np.asarray(services, dtype=float)
+        waits = lindley_chunk(inter_arrivals, services, self.last_wait, self.last_service)
+        arrival_times = np.cumsum(inter_arrivals)
+        arrival_times += self.arrival_time
+
+        self.customers += len(waits)
+        self.arrival_time = arrival_times[-1]
+        self.last_wait = waits[-1]
+        self.last_service = services[-1]
+        self.total_wait += waits.sum()
+        self.total_service += services.sum()
+        self.max_wait = max(self.max_wait, waits.max())
+        self.customers_delayed += int(np.count_nonzero(waits))
+        # FIFO single server: the last customer of the block departs last
+        self.end_time = arrival_times[-1] + waits[-1] + services[-1]
+        return arrival_times, waits
+
+    def results(self):
+        return {
+            "Average Delay in Queue": float(self.total_wait / self.customers),
+            "Average Number in Queue": float(self.total_wait / self.end_time),
+            "Server Utilization": float(self.total_service / self.end_time),
+            "Time Simulation Ended": float(self.end_time)
+        }
+
+
+def run_blocks(blocks, total=None, on_progress=None):
+    """
+    Push (inter_arrivals, services) blocks through a LindleyQueue and return its results.
+
+    After every block each callable in on_progress (a callable or a list of
+    them) receives a progress event dictionary with the running results and
+    the block data; subscribers decide themselves how often to redraw, the
+    engine never waits.
+    """
+    queue = LindleyQueue()
+    subscribers = [] if on_progress is None else on_progress if isinstance(on_progress, list) else [on_progress]
+
+    for inter_arrivals, services in blocks:
+        first_customer = queue.customers + 1
+        arrival_times, waits = queue.process(inter_arrivals, services)
+
+        if subscribers:
+            event = dict(queue.results(), customers=queue.customers, total=total, first_customer=first_customer,
+                         arrival_times=arrival_times, waits=waits, services=services)
+            for subscriber in subscribers:
+                subscriber(event)
+
+    return queue.results()
+
+
+def simulate_mm1(mean_inter_arrival, mean_service_time, num_customers, chunk_size=1_000_000, seed=None,
+                 on_progress=None):
+    """
+    Run an M/M/1 queue for `num_customers` customers in vectorized chunks.
+
+    Exponential times come from the in-house LCG in blocks of chunk_size, so
+    memory is O(chunk_size) and 10^8 customers run in seconds. Progress
+    events are published as in run_blocks.
+
+    Returns:
+        Dictionary with the same keys as mm1_queue_simulation_live
+    """
+    variates = VariateGenerator(LCGStream(seed).uniforms)
+
+    def blocks():
+        for start in range(0, num_customers, chunk_size):
+            m = min(chunk_size, num_customers - start)
+            inter_arrivals = variates.exponential(m, mean_inter_arrival)
+            yield inter_arrivals, variates.exponential(m, mean_service_time)
+
+    return run_blocks(blocks(), num_customers, on_progress)
+
+
+def main():
+    mean_inter_arrival = float(input("Mean inter-arrival time (default 1.0): ") or "1.0")
+    mean_service_time = float(input("Mean service time (default 0.8): ") or "0.8")
+    num_customers = int(input("Number of customers (default 100000000): ") or "100000000")
+
+    def report(event):
+        print(f"{event['customers']:>12d} / {event['total']} customers, "
+              f"avg delay {event['Average Delay in Queue']:.4f}")
+
+    results = simulate_mm1(mean_inter_arrival, mean_service_time, num_customers,
+                           chunk_size=10_000_000, on_progress=report)
+    print()
+    for key, value in results.items():
+        print(f"{key}: {value:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import os
+import sys
+import time
+import numpy as np
+from tabulate import tabulate
+from reliability_engine import Z_95
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "random numbers"))
+from variates import LCGStreams, exponential_from_uniforms, substream_seeds
+
+ELEMENT_BUDGET = 1 << 22  # Grid points x replications x customers held in memory per chunk
+
+
+def sweep_mm1(mean_inter_arrivals, mean_service_times, num_customers, num_replications=30, warmup=0, seed=1,
+              chunk_size=None):
+    """
+    M/M/1 delay and utilization over a whole (mean_inter_arrival, mean_service_time) grid at once.
+
+    Every replication draws one stream of unit exponentials for arrivals and
+    one for services, and grid point (i, j) scales them by
+    mean_inter_arrivals[i] and mean_service_times[j] (common random numbers).
+    The partial sums of Lindley's recursion then factor as
+    P = s_j * cumsum(E_service) - a_i * cumsum(E_arrival), so a chunk of the
+    recursion for all replications and grid points is one
+    (replications, arrivals, services, customers) array, as in
+    lindley.lindley_chunk. The first `warmup` customers of each replication
+    are left out of the delay averages.
+
+    Returns a dictionary of (arrivals, services) surfaces: delay and
+    utilization means with their confidence half-widths, plus the
+    per-replication values under "replicate_delay" and
+    "replicate_utilization" for paired comparisons.
+    """
+    a = np.atleast_1d(np.asarray(mean_inter_arrivals, dtype=float))
+    s = np.atleast_1d(np.asarray(mean_service_times, dtype=float))
+    shape = (num_replications, len(a), len(s))
+    if chunk_size is None:
+        chunk_size = max(256, ELEMENT_BUDGET // int(np.prod(shape)))
+
+    # Replication r uses its own independently seeded LCG stream, shared by every grid point
+    streams = LCGStreams(substream_seeds(seed, num_replications))
+    a4 = a[None, :, None, None]
+    s4 = s[None, None, :, None]
+
+    last_wait = np.zeros(shape)
+    last_unit_service = np.zeros(num_replications)
+    unit_arrival_time = np.zeros(num_replications)
+    unit_service_total = np.zeros(num_replications)
+    total_wait = np.zeros(shape)
+
+    for start in range(0, num_customers, chunk_size):
+        m = min(chunk_size, num_customers - start)
+        # Each replication draws m arrivals then m services, as VariateGenerator.exponential would
+        unit_draws = exponential_from_uniforms(streams.uniforms(2 * m))
+        unit_arrivals, unit_services = unit_draws[:, :m], unit_draws[:, m:]
+
+        # Customer k's increment uses the service time of customer k - 1
+        shifted = np.concatenate((last_unit_service[:, None], unit_services[:, :-1]), axis=1)
+        unit_service_sums = np.cumsum(shifted, axis=1)[:, None, None, :]
+        unit_arrival_sums = np.cumsum(unit_arrivals, axis=1)[:, None, None, :]
+        partial = s4 * unit_service_sums - a4 * unit_arrival_sums
+        running_min = np.minimum.accumulate(partial, axis=-1)
+        np.minimum(running_min, -last_wait[..., None], out=running_min)
+        waits = np.subtract(partial, running_min, out=partial)
+
+        skip = min(max(warmup - start, 0), m)
+        total_wait += waits[..., skip:].sum(axis=-1)
+        last_wait = waits[..., -1].copy()
+        last_unit_service = unit_services[:, -1]
+        unit_arrival_time += unit_arrivals.sum(axis=1)
+        unit_service_total += unit_services.sum(axis=1)
+
+    # FIFO single server: the last customer departs last
+    end_time = (a[None, :, None] * unit_arrival_time[:, None, None] + last_wait
+                + s[None, None, :] * last_unit_service[:, None, None])
+    delay = total_wait / (num_customers - min(warmup, num_customers))
+    utilization = s[None, None, :] * unit_service_total[:, None, None] / end_time
+
+    return {
+        "mean_inter_arrivals": a,
+        "mean_service_times": s,
+        "delay": delay.mean(axis=0),
+        "delay_half_width": _half_width(delay),
+        "utilization": utilization.mean(axis=0),
+        "utilization_half_width": _half_width(utilization),
+        "replicate_delay": delay,
+        "replicate_utilization": utilization
+    }
+
+
+def _half_width(replicates, z=Z_95):
+    if len(replicates) < 2:
+        return np.full(replicates.shape[1:], np.nan)
+    return z * replicates.std(axis=0, ddof=1) / np.sqrt(len(replicates))
+
+
+def paired_difference(replicates, first, second, z=Z_95):
+    """
+    Mean and CI half-width of replicates[:, first] - replicates[:, second] for two grid points.
+
+    The replications of both points share their random numbers, so the
+    differences are paired and their CI is much narrower than the one from
+    the two separate half-widths.
+    """
+    differences = replicates[(slice(None),) + tuple(first)] - replicates[(slice(None),) + tuple(second)]
+    return float(differences.mean()), float(z * differences.std(ddof=1) / np.sqrt(len(differences)))
+
+
+def adjacent_differences(replicates, axis, z=Z_95):
+    """Paired differences between neighbouring grid points along `axis` (0: arrivals, 1: services)."""
+    differences = np.diff(replicates, axis=axis + 1)
+    return differences.mean(axis=0), _half_width(differences, z)
+
+
+def main():
+    mean_inter_arrival = 1.0
+    mean_service_times = np.linspace(0.5, 0.9, 5)
+    mean_inter_arrivals = np.linspace(0.9, 1.3, 5)
+    num_customers, replications, warmup = 20_000, 30, 1000
+
+    start = time.perf_counter()
+    sweep = sweep_mm1(mean_inter_arrivals, mean_service_times, num_customers, replications, warmup)
+    sweep_time = time.perf_counter() - start
+
+    # Same grid and warm-up as separate single-replication runs with independent seeds
+    start = time.perf_counter()
+    seeds = iter(range(1, replications * len(mean_inter_arrivals) * len(mean_service_times) + 1))
+    separate = np.array([[[sweep_mm1(a, s, num_customers, 1, warmup, seed=next(seeds))["delay"][0, 0]
+                           for s in mean_service_times] for a in mean_inter_arrivals] for r in range(replications)])
+    separate_time = time.perf_counter() - start
+
+    i = list(mean_inter_arrivals).index(mean_inter_arrival)
+    rows = []
+    for j, s in enumerate(mean_service_times):
+        rho = s / mean_inter_arrival
+        rows.append([f"{s:.2f}", f"{rho:.2f}", f"{rho * s / (1 - rho):.4f}",
+                     f"{sweep['delay'][i, j]:.4f} +/- {sweep['delay_half_width'][i, j]:.4f}",
+                     f"{sweep['utilization'][i, j]:.4f} +/- {sweep['utilization_half_width'][i, j]:.4f}"])
+    print(f"Mean inter-arrival time {mean_inter_arrival}, {replications} replications of {num_customers} customers\n")
+    print(tabulate(rows, headers=["Mean Service", "rho", "M/M/1 Delay", "Delay", "Utilization"], tablefmt="grid"))
+
+    step, step_half = adjacent_differences(sweep["replicate_delay"], axis=1)
+    _, independent_half = adjacent_differences(separate, axis=1)
+    rows = [[f"{mean_service_times[j]:.2f} -> {mean_service_times[j + 1]:.2f}",
+             f"{step[i, j]:.4f}", f"{step_half[i, j]:.4f}", f"{independent_half[i, j]:.4f}"]
+            for j in range(len(mean_service_times) - 1)]
+    print("\nDelay increase per service-time step")
+    print(tabulate(rows, headers=["Step", "Difference", "Paired +/-", "Independent +/-"], tablefmt="grid"))
+
+    grid = len(mean_inter_arrivals) * len(mean_service_times)
+    print(f"\n{grid} grid points x {replications} replications: sweep {sweep_time:.2f} s, "
+          f"separate runs {separate_time:.2f} s ({separate_time / sweep_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
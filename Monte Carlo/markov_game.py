@@ -0,0 +1,125 @@
+import numpy as np
+
+
+def build_game_chain(threshold=3, max_flips=8):
+    """
+    Build the coin game as an absorbing Markov chain.
+
+    A transient state is a (flips, heads - tails) pair that has not ended the
+    game yet. The game is won as soon as |heads - tails| reaches `threshold`
+    and lost when `max_flips` flips are used up without that happening.
+
+    The head and tail moves are returned as separate matrices so the chain for
+    any head probability p is Q = p * Q_head + (1 - p) * Q_tail (same for R).
+
+    Returns:
+        states: List of transient (flips, difference) states, start state first
+        Q_head, Q_tail: Transient-to-transient moves, shape (n, n)
+        R_head, R_tail: Transient-to-absorbing moves, columns [win, lose]
+    """
+    if threshold < 1 or max_flips < 1:
+        raise ValueError(f"Need threshold >= 1 and max_flips >= 1, got {threshold} and {max_flips}")
+    states = [(flips, diff)
+              for flips in range(max_flips)
+              for diff in range(-threshold + 1, threshold)
+              if abs(diff) <= flips and (flips - diff) % 2 == 0]
+    index = {state: i for i, state in enumerate(states)}
+    n = len(states)
+
+    Q_head, Q_tail = np.zeros((n, n)), np.zeros((n, n))
+    R_head, R_tail = np.zeros((n, 2)), np.zeros((n, 2))
+
+    for i, (flips, diff) in enumerate(states):
+        for step, Q, R in ((1, Q_head, R_head), (-1, Q_tail, R_tail)):
+            new_diff = diff + step
+            if abs(new_diff) == threshold:
+                R[i, 0] = 1.0
+            elif flips + 1 == max_flips:
+                R[i, 1] = 1.0
+            else:
+                Q[i, index[(flips + 1, new_diff)]] = 1.0
+
+    return states, Q_head, Q_tail, R_head, R_tail
+
+
+def _solve_chains(threshold, max_flips, p_head):
+    # Solve (I - Q) [B | t] = [R | 1] for every head probability in one batched call
+    _, Q_head, Q_tail, R_head, R_tail = build_game_chain(threshold, max_flips)
+    n = Q_head.shape[0]
+    p = np.asarray(p_head, dtype=float).reshape(-1, 1, 1)
+
+    Q = p * Q_head + (1 - p) * Q_tail
+    R = p * R_head + (1 - p) * R_tail
+    rhs = np.concatenate([R, np.ones((len(p), n, 1))], axis=2)
+
+    solution = np.linalg.solve(np.eye(n) - Q, rhs)
+    start = solution[:, 0, :]  # row of the (0 flips, 0 difference) start state
+    return start[:, 0], start[:, 2]
+
+
+def solve_game(threshold=3, max_flips=8, p_head=0.5, win_payoff=1.0, lose_payoff=-1.0):
+    """Exact win probability, expected flips and expected earnings of one game."""
+    win_probability, expected_flips = _solve_chains(threshold, max_flips, [p_head])
+    win_probability, expected_flips = float(win_probability[0]), float(expected_flips[0])
+    expected_earnings = win_probability * win_payoff + (1 - win_probability) * lose_payoff
+
+    return {
+        'win_probability': win_probability,
+        'expected_flips': expected_flips,
+        'expected_earnings': expected_earnings
+    }
+
+
+def sweep_games(threshold=3, max_flips=8, p_head=0.5, win_payoff=1.0, lose_payoff=-1.0):
+    """
+    Solve the game for every combination of broadcast parameter arrays.
+
+    Parameters sharing the same (threshold, max_flips) chain structure are solved
+    together in a single batched np.linalg.solve call, so sweeping thousands of
+    head probabilities or payoffs costs about as much as a single solve.
+
+    Returns:
+        Dictionary of arrays shaped like the broadcast parameters
+    """
+    threshold, max_flips, p_head, win_payoff, lose_payoff = np.broadcast_arrays(
+        threshold, max_flips, p_head, win_payoff, lose_payoff)
+    shape = threshold.shape
+    threshold, max_flips, p_head = threshold.ravel(), max_flips.ravel(), p_head.ravel().astype(float)
+
+    win_probability = np.empty(threshold.size)
+    expected_flips = np.empty(threshold.size)
+
+    structures = np.unique(np.column_stack((threshold, max_flips)), axis=0)
+    for t, m in structures:
+        members = (threshold == t) & (max_flips == m)
+        win_probability[members], expected_flips[members] = _solve_chains(int(t), int(m), p_head[members])
+
+    win_probability = win_probability.reshape(shape)
+    expected_flips = expected_flips.reshape(shape)
+    expected_earnings = win_probability * win_payoff + (1 - win_probability) * lose_payoff
+
+    return {
+        'win_probability': win_probability,
+        'expected_flips': expected_flips,
+        'expected_earnings': expected_earnings
+    }
+
+
+def main():
+    exact = solve_game()
+    print("Exact solution of the coin game (threshold 3, at most 8 flips, fair coin)")
+    print("-" * 40)
+    print(f"Win Probability: {exact['win_probability']:.6f}")
+    print(f"Expected Flips: {exact['expected_flips']:.6f}")
+    print(f"Expected Earnings per Game: BDT. {exact['expected_earnings']:.6f}")
+
+    p_grid, flips_grid = np.meshgrid(np.linspace(0.05, 0.95, 1000), np.arange(3, 13))
+    sweep = sweep_games(3, flips_grid, p_grid)
+    best = np.unravel_index(np.argmax(sweep['expected_earnings']), p_grid.shape)
+    print(f"\nSwept {p_grid.size} parameter combinations")
+    print(f"Best game: p_head={p_grid[best]:.3f}, max_flips={flips_grid[best]}, "
+          f"expected earnings BDT. {sweep['expected_earnings'][best]:.4f}")
+
+
+if __name__ == "__main__":
+    main()
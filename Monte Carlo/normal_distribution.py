@@ -1,48 +1,65 @@
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+from fft_kde import fft_kde
 
-# Set random seed for reproducibility
-np.random.seed(0)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "random numbers"))
+from variates import LCGStream, VariateGenerator
 
-# Generate 7 random samples with sample size 200
+# 7 random samples with sample size 200
 sample_size = 200
 num_samples = 7
 mean = 100
 std_dev = 20
 
-samples = [np.random.normal(mean, std_dev, sample_size) for _ in range(num_samples)]
-
-# Plot unimodal density curves
-plt.figure(figsize=(10, 6))
-for sample in samples:
-    sns.kdeplot(sample, label='Sample')
-plt.title('Unimodal Density Curves of Normal Distribution')
-plt.xlabel('Value')
-plt.ylabel('Density')
-plt.legend()
-plt.show()  # Ensure this is called to display the plot
-
-# Generate multimodal density curve by combining samples
-combined_sample = np.concatenate(samples)
-plt.figure(figsize=(10, 6))
-sns.kdeplot(combined_sample, label='Combined Sample')
-plt.title('Multimodal Density Curve of Normal Distribution')
-plt.xlabel('Value')
-plt.ylabel('Density')
-plt.legend()
-plt.show()  # Ensure this is called to display the plot
-
-# Generate and plot histogram for blood pressure distribution
+# Blood pressure distribution
 blood_pressure_mean = 80
 blood_pressure_std_dev = 20
-blood_pressure_sample = np.random.normal(blood_pressure_mean, blood_pressure_std_dev, sample_size)
-
-plt.figure(figsize=(10, 6))
-plt.hist(blood_pressure_sample, bins=30, density=True, alpha=0.6, color='g', label='Blood Pressure Histogram')
-sns.kdeplot(blood_pressure_sample, color='r', label='KDE')
-plt.title('Distribution of Diastolic Blood Pressure for Men')
-plt.xlabel('Blood Pressure')
-plt.ylabel('Density')
-plt.legend()
-plt.show()  # Ensure this is called to display the plot
\ No newline at end of file
+
+
+def generate_samples(seed=0):
+    # Seeded in-house generator for reproducibility
+    variates = VariateGenerator(LCGStream(seed=seed).uniforms)
+    samples = [variates.normal(sample_size, mean, std_dev) for _ in range(num_samples)]
+    blood_pressure_sample = variates.normal(sample_size, blood_pressure_mean, blood_pressure_std_dev)
+    return samples, blood_pressure_sample
+
+
+def main():
+    import matplotlib.pyplot as plt
+
+    samples, blood_pressure_sample = generate_samples()
+
+    # Plot unimodal density curves
+    plt.figure(figsize=(10, 6))
+    for sample in samples:
+        plt.plot(*fft_kde(sample), label='Sample')
+    plt.title('Unimodal Density Curves of Normal Distribution')
+    plt.xlabel('Value')
+    plt.ylabel('Density')
+    plt.legend()
+    plt.show()  # Ensure this is called to display the plot
+
+    # Generate multimodal density curve by combining samples
+    combined_sample = np.concatenate(samples)
+    plt.figure(figsize=(10, 6))
+    plt.plot(*fft_kde(combined_sample), label='Combined Sample')
+    plt.title('Multimodal Density Curve of Normal Distribution')
+    plt.xlabel('Value')
+    plt.ylabel('Density')
+    plt.legend()
+    plt.show()  # Ensure this is called to display the plot
+
+    # Plot histogram for blood pressure distribution
+    plt.figure(figsize=(10, 6))
+    plt.hist(blood_pressure_sample, bins=30, density=True, alpha=0.6, color='g', label='Blood Pressure Histogram')
+    plt.plot(*fft_kde(blood_pressure_sample), color='r', label='KDE')
+    plt.title('Distribution of Diastolic Blood Pressure for Men')
+    plt.xlabel('Blood Pressure')
+    plt.ylabel('Density')
+    plt.legend()
+    plt.show()  # Ensure this is called to display the plot
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
 def f(x):
     return x**3
@@ -25,6 +24,8 @@ def monte_carlo_integration(num_points=1000):
     return integral, x, y, points_under_curve
 
 def plot_results(x, y, points_under_curve, num_points):
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(12, 8))
     
     # Plot the actual function
@@ -54,19 +55,24 @@ def plot_results(x, y, points_under_curve, num_points):
     plt.legend()
     plt.show()
 
-# Run simulations with different numbers of points
-num_points_list = [1000, 10000, 100000]
-exact_value = 152.25
+def main():
+    # Run simulations with different numbers of points
+    num_points_list = [1000, 10000, 100000]
+    exact_value = 152.25
 
-print("Exact value of integral:", exact_value)
-print("\nMonte Carlo approximations:")
+    print("Exact value of integral:", exact_value)
+    print("\nMonte Carlo approximations:")
 
-for num_points in num_points_list:
-    integral, x, y, points_under_curve = monte_carlo_integration(num_points)
-    error = abs(integral - exact_value)
-    print(f"\nNumber of points: {num_points}")
-    print(f"Estimated integral: {integral:.2f}")
-    print(f"Absolute error: {error:.2f}")
-    print(f"Relative error: {(error/exact_value)*100:.2f}%")
-    
-    plot_results(x, y, points_under_curve, num_points)
\ No newline at end of file
+    for num_points in num_points_list:
+        integral, x, y, points_under_curve = monte_carlo_integration(num_points)
+        error = abs(integral - exact_value)
+        print(f"\nNumber of points: {num_points}")
+        print(f"Estimated integral: {integral:.2f}")
+        print(f"Absolute error: {error:.2f}")
+        print(f"Relative error: {(error/exact_value)*100:.2f}%")
+
+        plot_results(x, y, points_under_curve, num_points)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+import heapq
+import os
+import sys
+import time
+import numpy as np
+from tabulate import tabulate
+from lindley import LindleyQueue
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "random numbers"))
+from variates import LCGStream, VariateGenerator, substream_seeds
+
+
+class Router:
+    """
+    Next-station draws for the customers leaving one station.
+
+    `probabilities` is the station's row of the routing matrix; the index
+    len(probabilities) stands for leaving the network, which takes whatever
+    probability the row leaves over.
+    """
+
+    def __init__(self, probabilities, uniforms, buffer_size=4096):
+        self.cdf = np.cumsum(probabilities)
+        if len(self.cdf) and np.isclose(self.cdf[-1], 1.0):
+            self.cdf[-1] = 1.0
+        self.uniforms = uniforms
+        self.buffer_size = buffer_size
+        self._buffer = []
+
+    def choose(self, count):
+        return np.searchsorted(self.cdf, self.uniforms(count), side='right')
+
+    def next(self):
+        if not self._buffer:
+            self._buffer = self.choose(self.buffer_size).tolist()[::-1]
+        return self._buffer.pop()
+
+
+class SojournTally:
+    """End-to-end time in system of the customers that have left the network."""
+
+    def __init__(self):
+        self.customers = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.maximum = 0.0
+        self.end_time = 0.0
+
+    def add(self, exit_times, sojourns):
+        if len(sojourns):
+            self.customers += len(sojourns)
+            self.total += sojourns.sum()
+            self.total_squares += np.dot(sojourns, sojourns)
+            self.maximum = max(self.maximum, sojourns.max())
+            self.end_time = max(self.end_time, exit_times.max())
+
+    def results(self):
+        mean = self.total / self.customers
+        return {
+            "Customers": self.customers,
+            "Average Time in System": float(mean),
+            "Std Time in System": float(np.sqrt(max(self.total_squares / self.customers - mean ** 2, 0.0))),
+            "Max Time in System": float(self.maximum),
+            "Average Number in System": float(self.total / self.end_time),
+            "Throughput": float(self.customers / self.end_time),
+            "Time Simulation Ended": float(self.end_time)
+        }
+
+
+def station_results(queue):
+    """lindley.LindleyQueue results plus the station's throughput and mean time in system."""
+    return dict(queue.results(),
+                **{"Customers": queue.customers,
+                   "Average Time in System": float((queue.total_wait + queue.total_service) / queue.customers),
+                   "Throughput": float(queue.customers / queue.end_time)})
+
+
+def simulate_tandem(mean_inter_arrival, mean_service_times, num_customers, chunk_size=1_000_000, seed=1):
+    """
+    Poisson arrivals through a line of FIFO single-server stations.
+
+    Each chunk of customers passes the stations in turn: the departure times
+    of station k, a_i + w_i + s_i, are the arrival times of station k + 1, so
+    every station is one vectorized Lindley recursion per chunk and the
+    cost is O(stations x customers) NumPy work with O(chunk_size) memory.
+    Each station draws its service times from its own substream.
+
+    Returns:
+        Dictionary with a list of per-station results under "stations" and
+        the end-to-end results under "network"
+    """
+    seeds = substream_seeds(seed, len(mean_service_times) + 1).tolist()
+    arrivals = VariateGenerator(LCGStream(seeds[0]).uniforms)
+    services = [VariateGenerator(LCGStream(s).uniforms) for s in seeds[1:]]
+    stations = [LindleyQueue() for _ in mean_service_times]
+    last_departure = np.zeros(len(stations))
+    sojourn = SojournTally()
+
+    for start in range(0, num_customers, chunk_size):
+        m = min(chunk_size, num_customers - start)
+        inter_arrivals = arrivals.exponential(m, mean_inter_arrival)
+        entry_times = None
+        for k, (queue, generator, mean_service_time) in enumerate(zip(stations, services, mean_service_times)):
+            service_times = generator.exponential(m, mean_service_time)
+            departures, waits = queue.process(inter_arrivals, service_times)
+            if entry_times is None:
+                entry_times = departures.copy()
+            departures += waits
+            departures += service_times
+            inter_arrivals = np.diff(departures, prepend=last_departure[k])
+            last_departure[k] = departures[-1]
+        sojourn.add(departures[-1:], departures - entry_times)
+
+    return {"stations": [station_results(queue) for queue in stations], "network": sojourn.results()}
+
+
+def is_acyclic(routing):
+    return topological_order(routing) is not None
+
+
+def topological_order(routing):
+    """Stations ordered so that every route goes forward, or None if the routing has a cycle."""
+    edges = np.asarray(routing) > 0
+    indegree = edges.sum(axis=0)
+    ready = [j for j in range(len(edges)) if indegree[j] == 0]
+    order = []
+    while ready:
+        i = ready.pop()
+        order.append(i)
+        for j in np.flatnonzero(edges[i]):
+            indegree[j] -= 1
+            if indegree[j] == 0:
+                ready.append(j)
+    return order if len(order) == len(edges) else None
+
+
+def traffic_equations(arrival_rates, routing):
+    """Total arrival rate of every station, lambda = gamma + P^T lambda."""
+    routing = np.asarray(routing, dtype=float)
+    return np.linalg.solve(np.eye(len(routing)) - routing.T, np.asarray(arrival_rates, dtype=float))
+
+
+def jackson_analytic(arrival_rates, service_rates, routing):
+    """
+    Product-form values of an open Jackson network of single-server stations.
+
+    Every station behaves as an M/M/1 queue at its traffic-equation rate, and
+    by Little's law the mean end-to-end time is the total number in system
+    over the external arrival rate.
+    """
+    rates = traffic_equations(arrival_rates, routing)
+    service_rates = np.asarray(service_rates, dtype=float)
+    rho = rates / service_rates
+    if np.any(rho >= 1):
+        raise ValueError(f"Unstable network, utilizations {rho}")
+    in_system = rho / (1 - rho)
+    return {
+        "arrival_rates": rates,
+        "utilization": rho,
+        "delay": rho / (service_rates - rates),
+        "number_in_queue": rho ** 2 / (1 - rho),
+        "time_in_system": in_system.sum() / np.sum(arrival_rates)
+    }
+
+
+def simulate_jackson(arrival_rates, service_rates, routing, num_customers, chunk_size=200_000, seed=1,
+                     method=None):
+    """
+    Open network of FIFO single-server stations with Poisson arrivals and probabilistic routing.
+
+    arrival_rates[j] is the external arrival rate of station j and
+    routing[i][j] the probability that a customer leaving i goes to j; the
+    rest of row i is the probability of leaving the network. The run ends when
+    all of the first `num_customers` external arrivals have left.
+
+    Feed-forward routing runs vectorized (method "vectorized"); networks with
+    cycles, where a station's arrivals depend on its own departures, fall
+    back to an event-driven run ("event"), which can also be requested for
+    any network to cross-check the vectorized one.
+
+    Returns:
+        Dictionary with a list of per-station results under "stations" and
+        the end-to-end results under "network"
+    """
+    routing = np.asarray(routing, dtype=float)
+    if np.any(routing < 0) or np.any(routing.sum(axis=1) > 1 + 1e-12):
+        raise ValueError("Routing rows must be probabilities summing to at most 1")
+    if method is None:
+        method = "vectorized" if is_acyclic(routing) else "event"
+    if method == "vectorized":
+        return _simulate_feed_forward(arrival_rates, service_rates, routing, num_customers, chunk_size, seed)
+    if method == "event":
+        return _simulate_events(arrival_rates, service_rates, routing, num_customers, seed)
+    raise ValueError(f"Unknown method {method!r}")
+
+
+def _network_streams(arrival_rates, service_rates, routing, seed):
+    # Substreams: external arrivals, entry station, then service and routing per station
+    n = len(routing)
+    seeds = substream_seeds(seed, 2 * n + 2).tolist()
+    arrival_rates = np.asarray(arrival_rates, dtype=float)
+    arrivals = VariateGenerator(LCGStream(seeds[0]).uniforms)
+    entry = Router(arrival_rates / arrival_rates.sum(), LCGStream(seeds[1]).uniforms)
+    services = [VariateGenerator(LCGStream(s).uniforms) for s in seeds[2:n + 2]]
+    routers = [Router(routing[j], LCGStream(s).uniforms) for j, s in enumerate(seeds[n + 2:])]
+    return arrivals, entry, services, routers
+
+
+def _simulate_feed_forward(arrival_rates, service_rates, routing, num_customers, chunk_size, seed):
+    """
+    Feed-forward network as a stream of vectorized chunks.
+
+    Stations run in topological order. A station's arrivals are the merge of
+    its external arrivals and the departures routed to it; each source
+    delivers its times in increasing order, so every arrival up to the
+    smallest time the sources have reached (the watermark) is final and can
+    be released through the station's Lindley recursion, while later ones
+    wait for the next chunk. Departures never precede the station's
+    watermark, which gives the watermark the station passes downstream.
+    """
+    n = len(routing)
+    arrivals, entry, services, routers = _network_streams(arrival_rates, service_rates, routing, seed)
+    total_rate = float(np.sum(arrival_rates))
+    mean_service_times = 1 / np.asarray(service_rates, dtype=float)
+    sources = [np.flatnonzero(routing[:, j]) for j in range(n)]
+    external = np.asarray(arrival_rates) > 0
+
+    stations = [LindleyQueue() for _ in range(n)]
+    pending = [[] for _ in range(n)]  # Lists of (arrival_times, entry_times) not yet released
+    last_arrival = np.zeros(n)
+    watermark = np.zeros(n)
+    sojourn = SojournTally()
+    clock = 0.0
+
+    for start in range(0, num_customers + chunk_size, chunk_size):
+        m = min(chunk_size, num_customers - start)
+        if m > 0:
+            times = clock + np.cumsum(arrivals.exponential(m, 1 / total_rate))
+            clock = times[-1]
+            stations_entered = entry.choose(m)
+            for j in np.flatnonzero(external):
+                mask = stations_entered == j
+                pending[j].append((times[mask], times[mask]))
+            external_mark = clock
+        else:
+            external_mark = np.inf  # Last pass drains the network
+
+        for j in topological_order(routing):
+            mark = min([watermark[i] for i in sources[j]], default=np.inf)
+            if external[j]:
+                mark = min(mark, external_mark)
+            if not pending[j]:
+                watermark[j] = max(watermark[j], mark)
+                continue
+
+            times = np.concatenate([t for t, _ in pending[j]])
+            entry_times = np.concatenate([e for _, e in pending[j]])
+            order = np.argsort(times, kind='stable')
+            times, entry_times = times[order], entry_times[order]
+            cut = np.searchsorted(times, mark, side='right')
+            pending[j] = [(times[cut:], entry_times[cut:])] if cut < len(times) else []
+            if cut == 0:
+                watermark[j] = max(watermark[j], mark)
+                continue
+
+            times, entry_times = times[:cut], entry_times[:cut]
+            service_times = services[j].exponential(cut, mean_service_times[j])
+            _, waits = stations[j].process(np.diff(times, prepend=last_arrival[j]), service_times)
+            last_arrival[j] = times[-1]
+            departures = times + waits + service_times
+            watermark[j] = max(departures[-1], mark)
+
+            destinations = routers[j].choose(cut)
+            leaving = destinations == n
+            sojourn.add(departures[leaving], departures[leaving] - entry_times[leaving])
+            for k in np.unique(destinations[~leaving]):
+                mask = destinations == k
+                pending[k].append((departures[mask], entry_times[mask]))
+
+    return {"stations": [station_results(queue) for queue in stations], "network": sojourn.results()}
+
+
+def _simulate_events(arrival_rates, service_rates, routing, num_customers, seed):
+    """
+    Event-driven run for any routing, cyclic or not.
+
+    The only events are arrivals, taken from a heap in time order. A FIFO
+    single server serves in arrival order, so an arrival at time t starts
+    service at max(t, time the server frees up) and its departure, with the
+    routing decision, is known at once and is pushed as the arrival at the
+    next station.
+    """
+    n = len(routing)
+    arrivals, entry, services, routers = _network_streams(arrival_rates, service_rates, routing, seed)
+    mean_inter_arrival = 1 / float(np.sum(arrival_rates))
+    mean_service_times = (1 / np.asarray(service_rates, dtype=float)).tolist()
+
+    stations = [LindleyQueue() for _ in range(n)]
+    free_at = [0.0] * n
+    total_wait = [0.0] * n
+    total_service = [0.0] * n
+    visits = [0] * n
+    delayed = [0] * n
+    exit_times, sojourns = [], []
+
+    heap = []  # Routed arrivals as (time, sequence, station, entry time)
+    sequence = 0
+    next_external = arrivals.next_exponential(mean_inter_arrival)
+    external = 0
+
+    while heap or external < num_customers:
+        if external < num_customers and (not heap or next_external < heap[0][0]):
+            t = entered = next_external
+            j = entry.next()
+            external += 1
+            next_external = t + arrivals.next_exponential(mean_inter_arrival)
+        else:
+            t, _, j, entered = heapq.heappop(heap)
+
+        start = free_at[j] if free_at[j] > t else t
+        service = services[j].next_exponential(mean_service_times[j])
+        departure = free_at[j] = start + service
+        total_wait[j] += start - t
+        total_service[j] += service
+        visits[j] += 1
+        delayed[j] += start > t
+
+        k = routers[j].next()
+        if k == n:
+            exit_times.append(departure)
+            sojourns.append(departure - entered)
+        else:
+            heapq.heappush(heap, (departure, sequence, k, entered))
+            sequence += 1
+
+    for j, queue in enumerate(stations):
+        queue.customers = visits[j]
+        queue.total_wait = total_wait[j]
+        queue.total_service = total_service[j]
+        queue.customers_delayed = delayed[j]
+        queue.end_time = free_at[j]
+    sojourn = SojournTally()
+    sojourn.add(np.array(exit_times), np.array(sojourns))
+    return {"stations": [station_results(queue) for queue in stations], "network": sojourn.results()}
+
+
+def main():
+    num_stations, num_customers = 10, 10_000_000
+    mean_inter_arrival = 1.0
+    mean_service_times = np.linspace(0.5, 0.8, num_stations)
+
+    start = time.perf_counter()
+    tandem = simulate_tandem(mean_inter_arrival, mean_service_times, num_customers)
+    elapsed = time.perf_counter() - start
+
+    rows = []
+    for k, (s, result) in enumerate(zip(mean_service_times, tandem["stations"])):
+        rho = s / mean_inter_arrival
+        rows.append([k + 1, f"{rho:.3f}", f"{result['Server Utilization']:.4f}",
+                     f"{result['Average Delay in Queue']:.4f}", f"{rho * s / (1 - rho):.4f}"])
+    expected = float(np.sum(mean_service_times / (1 - mean_service_times / mean_inter_arrival)))
+    print(f"Tandem line of {num_stations} stations, {num_customers:,} customers in {elapsed:.2f} s\n")
+    print(tabulate(rows, headers=["Station", "rho", "Utilization", "Delay", "M/M/1 Delay"], tablefmt="grid"))
+    print(f"End-to-end time in system {tandem['network']['Average Time in System']:.4f} "
+          f"(Burke/Jackson {expected:.4f})\n")
+
+    networks = {
+        "Feed-forward": ([0.6, 0.3, 0.0, 0.0], [1.5, 1.2, 1.4, 1.0],
+                         [[0.0, 0.3, 0.5, 0.0],
+                          [0.0, 0.0, 0.4, 0.5],
+                          [0.0, 0.0, 0.0, 0.7],
+                          [0.0, 0.0, 0.0, 0.0]]),
+        "With feedback": ([0.5, 0.2, 0.0], [1.6, 1.0, 1.2],
+                          [[0.0, 0.6, 0.2],
+                           [0.1, 0.0, 0.5],
+                           [0.2, 0.0, 0.0]]),
+    }
+    rows = []
+    for name, (gamma, mu, routing) in networks.items():
+        analytic = jackson_analytic(gamma, mu, routing)
+        methods = ["vectorized", "event"] if is_acyclic(routing) else ["event"]
+        for method in methods:
+            start = time.perf_counter()
+            result = simulate_jackson(gamma, mu, routing, 1_000_000, method=method)
+            elapsed = time.perf_counter() - start
+            utilization = [r["Server Utilization"] for r in result["stations"]]
+            rows.append([name, method, " ".join(f"{u:.3f}" for u in utilization),
+                         " ".join(f"{u:.3f}" for u in analytic["utilization"]),
+                         f"{result['network']['Average Time in System']:.4f}",
+                         f"{analytic['time_in_system']:.4f}", f"{elapsed:.2f}"])
+    print("Open Jackson networks, 1,000,000 external arrivals")
+    print(tabulate(rows, headers=["Network", "Method", "Utilizations", "Traffic Equations", "Time in System",
+                                  "Jackson", "Time (s)"], tablefmt="grid"))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,62 +1,159 @@
-import numpy as np
-import matplotlib.pyplot as plt
 import time
+import numpy as np
+from random_walk_ensemble import DIRECTION_NAMES, build_direction_table, build_move_table
+
+TABLE_ROWS = 50  # Steps printed in the terminal table
+
+
+class LiveWalkView:
+    """
+    Live random-walk plot that redraws incrementally.
+
+    The path is a single Line2D updated with set_data and blitted over a cached
+    background, the path is decimated to about two points per horizontal pixel,
+    and redraws are capped at max_fps so rendering never slows the walk down.
+    """
+
+    def __init__(self, total_steps, max_fps=30):
+        import matplotlib.pyplot as plt  # Only loaded when a live view is requested
+
+        self.plt = plt
+        self.total_steps = total_steps
+        self.min_interval = 1.0 / max_fps
+        self.last_draw = float('-inf')
+
+        plt.ion()  # Turn on interactive mode
+        self.fig, self.ax = plt.subplots(figsize=(6, 6))
+        ax = self.ax
+        ax.set_xlabel("X Position")
+        ax.set_ylabel("Y Position")
+        ax.set_title(f"Random Walk - {total_steps} steps")
+        ax.axhline(y=0, color='black', linewidth=1)
+        ax.axvline(x=0, color='black', linewidth=1)
+        ax.grid()
+        ax.set_xlim(-10, 10)
+        ax.set_ylim(-10, 10)
+
+        self.path_line, = ax.plot([], [], linestyle='-', linewidth=1, label="Random Walk Path", animated=True)
+        ax.scatter([0], [0], color='green', s=100, label="Start (0,0)", zorder=3)  # Start position
+        self.head, = ax.plot([], [], 'o', color='red', markersize=10, label="Current Position", animated=True)
+        self.step_text = ax.text(0.02, 0.97, "", transform=ax.transAxes, va='top', animated=True)
+        ax.legend(loc='lower right')
+
+        self.max_points = 2 * int(ax.bbox.width)
+        self.background = None
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+        self.fig.canvas.draw()
+        plt.show(block=False)
+
+    def _on_draw(self, event):
+        # Cache everything static; called again whenever the axes are rescaled
+        self.background = self.fig.canvas.copy_from_bbox(self.ax.bbox)
+        self.max_points = 2 * int(self.ax.bbox.width)
+
+    def _fit_limits(self, x, y):
+        # Grow the view by doubling so full redraws happen only O(log n) times
+        x_lo, x_hi = self.ax.get_xlim()
+        y_lo, y_hi = self.ax.get_ylim()
+        if x_lo <= x.min() and x.max() <= x_hi and y_lo <= y.min() and y.max() <= y_hi:
+            return False
+        while not (x_lo <= x.min() and x.max() <= x_hi):
+            x_lo, x_hi = 2 * x_lo, 2 * x_hi
+        while not (y_lo <= y.min() and y.max() <= y_hi):
+            y_lo, y_hi = 2 * y_lo, 2 * y_hi
+        self.ax.set_xlim(x_lo, x_hi)
+        self.ax.set_ylim(y_lo, y_hi)
+        return True
+
+    def update(self, x_path, y_path, step, force=False):
+        now = time.perf_counter()
+        if not force and now - self.last_draw < self.min_interval:
+            return
+        self.last_draw = now
+
+        x, y = x_path[:step + 1], y_path[:step + 1]
+        if len(x) > self.max_points:
+            stride = -(-len(x) // self.max_points)
+            x = np.append(x[::stride], x[-1])
+            y = np.append(y[::stride], y[-1])
+
+        if self._fit_limits(x, y):
+            self.fig.canvas.draw()  # refreshes the cached background through _on_draw
+
+        self.path_line.set_data(x, y)
+        self.head.set_data([x[-1]], [y[-1]])
+        self.step_text.set_text(f"Step {step}/{self.total_steps} ({x[-1]},{y[-1]})")
+
+        canvas = self.fig.canvas
+        canvas.restore_region(self.background)
+        self.ax.draw_artist(self.path_line)
+        self.ax.draw_artist(self.head)
+        self.ax.draw_artist(self.step_text)
+        canvas.blit(self.ax.bbox)
+        canvas.flush_events()
+
+    def finish(self):
+        # Hand the final frame to a regular, non-animated draw and keep it open
+        for artist in (self.path_line, self.head, self.step_text):
+            artist.set_animated(False)
+        self.plt.ioff()
+        self.fig.canvas.draw()
+        self.plt.show()
+
+
+def random_walk(steps, view=None, frames=300, seed=None):
+    """
+    Walk `steps` steps from (0, 0) and return the x and y paths.
+
+    Steps are generated in blocks of about steps / frames moves with a digit
+    lookup table, so the walk advances at NumPy speed; the view (if any) is
+    offered every block and decides itself whether to redraw.
+    """
+    rng = np.random.default_rng(seed)
+    dx_table, dy_table = build_move_table()
+    direction_of = build_direction_table()
+
+    x_path = np.zeros(steps + 1, dtype=np.int32)
+    y_path = np.zeros(steps + 1, dtype=np.int32)
+    block = max(1, steps // frames)
+
+    # Print table header
+    print(f"\n{'Step':<6} {'Random Number':<15} {'Direction':<10} {'Position (x,y)':<15}")
+    print("=" * 50)
+
+    for start in range(1, steps + 1, block):
+        stop = min(start + block, steps + 1)
+        digits = rng.integers(0, 10, size=stop - start)  # Random numbers (0 to 9)
+
+        np.cumsum(dx_table[digits], dtype=np.int32, out=x_path[start:stop])
+        np.cumsum(dy_table[digits], dtype=np.int32, out=y_path[start:stop])
+        x_path[start:stop] += x_path[start - 1]
+        y_path[start:stop] += y_path[start - 1]
+
+        # Print step details in table format for the first steps
+        for step in range(start, min(stop, TABLE_ROWS + 1)):
+            direction = DIRECTION_NAMES[direction_of[digits[step - start]]]
+            print(f"{step:<6} {digits[step - start]:<15} {direction:<10} ({x_path[step]}, {y_path[step]})")
+        if start <= TABLE_ROWS < stop and steps > TABLE_ROWS:
+            print(f"... (table limited to the first {TABLE_ROWS} steps)")
+
+        if view is not None:
+            view.update(x_path, y_path, stop - 1, force=stop == steps + 1)
+
+    return x_path, y_path
+
+
+def main():
+    # Take user input for the number of steps
+    steps = int(input("Enter the number of steps for the random walk: "))
+
+    view = LiveWalkView(steps)
+    x_path, y_path = random_walk(steps, view)
+    print(f"\nFinal position after {steps} steps: ({x_path[-1]}, {y_path[-1]})")
+
+    # Keep the final plot open
+    view.finish()
+
 
-# Take user input for the number of steps
-steps = int(input("Enter the number of steps for the random walk: "))
-
-# Initialize starting position
-x, y = 0, 0
-
-# Store the path for visualization
-x_path, y_path = [x], [y]
-
-# Print table header
-print(f"\n{'Step':<6} {'Random Number':<15} {'Direction':<10} {'Position (x,y)':<15}")
-print("=" * 50)
-
-# Set up the figure for live updating
-plt.ion()  # Turn on interactive mode
-fig, ax = plt.subplots(figsize=(6, 6))
-
-# Perform the random walk
-for step in range(1, steps + 1):
-    rand_num = np.random.randint(0, 10)  # Generate a random number (0 to 9)
-
-    # Determine movement based on the random number
-    if rand_num in [0, 1, 2, 3, 4]:  # Move Forward
-        direction = "Forward"
-        y += 1
-    elif rand_num in [5, 6, 7]:  # Move Left
-        direction = "Left"
-        x -= 1
-    else:  # Move Right (8,9)
-        direction = "Right"
-        x += 1
-
-    # Store path
-    x_path.append(x)
-    y_path.append(y)
-
-    # Print step details in table format
-    print(f"{step:<6} {rand_num:<15} {direction:<10} ({x}, {y})")
-
-    # Plot the updated graph
-    ax.clear()
-    ax.plot(x_path, y_path, marker='o', linestyle='-', markersize=4, label="Random Walk Path")
-    ax.scatter([0], [0], color='green', s=100, label="Start (0,0)")  # Start position
-    ax.scatter([x], [y], color='red', s=100, label=f"Step {step} ({x},{y})")  # Current position
-    ax.set_xlabel("X Position")
-    ax.set_ylabel("Y Position")
-    ax.set_title(f"Random Walk - Step {step}/{steps}")
-    ax.axhline(y=0, color='black', linewidth=1)
-    ax.axvline(x=0, color='black', linewidth=1)
-    ax.legend()
-    ax.grid()
-
-    plt.draw()
-    plt.pause(0.5)  # Pause for animation effect
-
-# Keep the final plot open
-plt.ioff()
-plt.show()
+if __name__ == "__main__":
+    main()
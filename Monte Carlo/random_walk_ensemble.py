@@ -0,0 +1,142 @@
+import numpy as np
+from tabulate import tabulate
+
+# Moves of the original walk: forward, left, right
+DIRECTION_NAMES = ["Forward", "Left", "Right"]
+DIRECTION_MOVES = np.array([[0, 1], [-1, 0], [1, 0]], dtype=np.int8)
+DIRECTION_PROBABILITIES = [0.5, 0.3, 0.2]  # digits 0-4, 5-7 and 8-9
+
+
+def build_direction_table(probabilities=DIRECTION_PROBABILITIES, resolution=10):
+    """
+    Map the digits 0..resolution-1 to move indices.
+
+    Each move gets a contiguous block of digits proportional to its probability,
+    exactly like the 0-4 / 5-7 / 8-9 split of random_walk.py when resolution=10.
+    """
+    probabilities = np.asarray(probabilities, dtype=float)
+    if not np.isclose(probabilities.sum(), 1.0):
+        raise ValueError("Direction probabilities must sum to 1")
+
+    bounds = np.rint(np.cumsum(probabilities) * resolution).astype(int)
+    if not np.allclose(np.diff(bounds, prepend=0) / resolution, probabilities):
+        raise ValueError(f"Probabilities {probabilities.tolist()} cannot be represented with {resolution} digits")
+
+    return np.searchsorted(bounds, np.arange(resolution), side='right')
+
+
+def build_move_table(probabilities=DIRECTION_PROBABILITIES, moves=DIRECTION_MOVES, resolution=10):
+    """
+    Map the digits 0..resolution-1 to (dx, dy) moves, by way of build_direction_table.
+
+    Returns:
+        dx_table, dy_table: int8 lookup tables indexed by the random digit
+    """
+    moves = np.asarray(moves, dtype=np.int8)
+    if len(probabilities) != len(moves):
+        raise ValueError("Need one probability per move")
+
+    owner = build_direction_table(probabilities, resolution)
+    return moves[owner, 0].copy(), moves[owner, 1].copy()
+
+
+def simulate_walkers(n_walkers, n_steps, probabilities=DIRECTION_PROBABILITIES, moves=DIRECTION_MOVES,
+                     resolution=10, passage_radius=10.0, walker_chunk=4096, step_chunk=1024, seed=None):
+    """
+    Simulate an ensemble of independent random walkers starting at (0, 0).
+
+    Steps are drawn as digits, mapped to int8 moves through the lookup table and
+    turned into positions with a cumsum over one (walker_chunk, step_chunk) block
+    at a time, so memory stays bounded no matter how many walkers or steps are
+    requested. Statistics are updated after each block.
+
+    Returns:
+        Dictionary with per-walker arrays:
+            endpoints: Final (x, y) positions, shape (n_walkers, 2)
+            first_passage: First step at which the distance from the origin
+                reaches passage_radius, or -1 if it never does
+            max_excursion: Largest distance from the origin along the path
+    """
+    rng = np.random.default_rng(seed)
+    dx_table, dy_table = build_move_table(probabilities, moves, resolution)
+    digit_dtype = np.uint8 if resolution <= 256 else np.uint32
+    radius_sq = passage_radius ** 2
+
+    endpoints = np.zeros((n_walkers, 2), dtype=np.int32)
+    first_passage = np.full(n_walkers, -1, dtype=np.int64)
+    max_excursion_sq = np.zeros(n_walkers, dtype=np.int64)
+
+    for w0 in range(0, n_walkers, walker_chunk):
+        w1 = min(w0 + walker_chunk, n_walkers)
+        x = endpoints[w0:w1, 0]
+        y = endpoints[w0:w1, 1]
+        passage = first_passage[w0:w1]
+        excursion = max_excursion_sq[w0:w1]
+
+        for s0 in range(0, n_steps, step_chunk):
+            s1 = min(s0 + step_chunk, n_steps)
+            digits = rng.integers(0, resolution, size=(w1 - w0, s1 - s0), dtype=digit_dtype)
+
+            # Positions of this block, continuing from the carried endpoints
+            path_x = np.cumsum(dx_table[digits], axis=1, dtype=np.int32)
+            path_x += x[:, np.newaxis]
+            path_y = np.cumsum(dy_table[digits], axis=1, dtype=np.int32)
+            path_y += y[:, np.newaxis]
+
+            dist_sq = path_x.astype(np.int64) ** 2
+            dist_sq += path_y.astype(np.int64) ** 2
+            np.maximum(excursion, dist_sq.max(axis=1), out=excursion)
+
+            waiting = passage < 0
+            if waiting.any():
+                reached = dist_sq[waiting] >= radius_sq
+                hit = reached.any(axis=1)
+                rows = np.flatnonzero(waiting)[hit]
+                passage[rows] = s0 + reached[hit].argmax(axis=1) + 1
+
+            x[:] = path_x[:, -1]
+            y[:] = path_y[:, -1]
+
+    return {
+        'endpoints': endpoints,
+        'first_passage': first_passage,
+        'max_excursion': np.sqrt(max_excursion_sq)
+    }
+
+
+def summarize_walkers(results, passage_radius=10.0):
+    """Summary rows for the endpoint, first-passage and excursion distributions."""
+    endpoints = results['endpoints']
+    passage = results['first_passage']
+    reached = passage[passage >= 0]
+    excursion = results['max_excursion']
+
+    rows = [
+        ["Mean endpoint (x, y)", f"({endpoints[:, 0].mean():.3f}, {endpoints[:, 1].mean():.3f})"],
+        ["Endpoint std (x, y)", f"({endpoints[:, 0].std():.3f}, {endpoints[:, 1].std():.3f})"],
+        ["Mean distance at end", f"{np.hypot(endpoints[:, 0], endpoints[:, 1]).mean():.3f}"],
+        [f"Reached radius {passage_radius:g}", f"{len(reached) / len(passage):.2%}"],
+    ]
+    if len(reached):
+        rows.append(["Mean first-passage step", f"{reached.mean():.2f}"])
+        rows.append(["Median first-passage step", f"{np.median(reached):.0f}"])
+    rows.append(["Mean max excursion", f"{excursion.mean():.3f}"])
+    rows.append(["99th pct max excursion", f"{np.percentile(excursion, 99):.3f}"])
+    return rows
+
+
+def main():
+    n_walkers = int(input("Enter the number of walkers (default 1000000): ") or "1000000")
+    n_steps = int(input("Enter the number of steps per walker (default 100): ") or "100")
+    radius = float(input("Enter the first-passage radius (default 10): ") or "10")
+
+    results = simulate_walkers(n_walkers, n_steps, passage_radius=radius)
+
+    print(f"\nEnsemble of {n_walkers} walkers, {n_steps} steps each")
+    print("Directions: " + ", ".join(f"{name} {p:.0%}" for name, p in
+                                     zip(DIRECTION_NAMES, DIRECTION_PROBABILITIES)))
+    print(tabulate(summarize_walkers(results, radius), headers=["Statistic", "Value"], tablefmt="grid"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import numpy as np
+from tabulate import tabulate
+from discrete_sampler import DiscreteDistribution
+
+# Probability distributions for bearing life (hours) and repair delay (minutes)
+bearing_life_distribution = [
+    (1000, 0.10), (1100, 0.14), (1200, 0.24), (1300, 0.14), (1400, 0.12),
+    (1500, 0.10), (1600, 0.06), (1700, 0.05), (1800, 0.03), (1900, 0.02)
+]
+delay_distribution = [(4, 0.3), (6, 0.6), (8, 0.1)]
+
+NUM_BEARINGS = 3
+REPLACEMENT_TIME_PER_SET = 40  # Minutes to replace all three bearings
+BEARING_COST = 32  # Per bearing
+DOWNTIME_COST_PER_MINUTE = 10
+REPAIRPERSON_COST_PER_HOUR = 30
+
+Z_95 = 1.959964
+
+
+class RatioEstimator:
+    """
+    Running estimate of sum(numerator) / sum(denominator) with a delta-method CI.
+
+    Only the five first and second order sums are kept, so any number of
+    chunks can be added in O(1) memory.
+    """
+
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self.n = 0
+        self.sum_x = self.sum_y = 0.0
+        self.sum_xx = self.sum_yy = self.sum_xy = 0.0
+
+    def add(self, numerator, denominator):
+        x = np.asarray(numerator, dtype=float)
+        y = np.asarray(denominator, dtype=float)
+        self.n += x.size
+        self.sum_x += x.sum()
+        self.sum_y += y.sum()
+        self.sum_xx += np.dot(x, x)
+        self.sum_yy += np.dot(y, y)
+        self.sum_xy += np.dot(x, y)
+
+    def estimate(self):
+        return self.scale * self.sum_x / self.sum_y
+
+    def half_width(self, z=Z_95):
+        n = self.n
+        if n < 2:
+            return float('nan')  # No spread to estimate from a single observation
+        mean_x, mean_y = self.sum_x / n, self.sum_y / n
+        ratio = mean_x / mean_y
+        var_x = self.sum_xx / n - mean_x ** 2
+        var_y = self.sum_yy / n - mean_y ** 2
+        cov_xy = self.sum_xy / n - mean_x * mean_y
+        var_ratio = max(var_x - 2 * ratio * cov_xy + ratio ** 2 * var_y, 0.0) / (mean_y ** 2 * (n - 1))
+        return self.scale * z * np.sqrt(var_ratio)
+
+
+def simulate_replacement_cycles(n_cycles, chunk_size=1_000_000, head=20, seed=None):
+    """
+    Simulate `n_cycles` cycles of the replace-all-at-first-failure policy.
+
+    Each chunk draws bearing lives as an (m, 3) array, takes the row-wise min
+    as the first failure, and uses cumsum (carried across chunks) for the
+    cumulative life. Only running sums are kept, plus the first `head` rows
+    for display.
+
+    Returns:
+        Dictionary of totals, per-1000-hour estimates with 95% CI half-widths
+        and the head table rows
+    """
+    if n_cycles < 1:
+        raise ValueError(f"Need at least one replacement cycle, got {n_cycles}")
+    rng = np.random.default_rng(seed)
+    bearing_sampler = DiscreteDistribution(bearing_life_distribution)
+    delay_sampler = DiscreteDistribution(delay_distribution)
+
+    downtime = RatioEstimator(scale=1000)
+    cost = RatioEstimator(scale=1000)
+    cumulative_life = 0
+    total_delay = 0
+    head_rows = []
+
+    for start in range(0, n_cycles, chunk_size):
+        m = min(chunk_size, n_cycles - start)
+        lives = bearing_sampler.sample((m, NUM_BEARINGS), rng)
+        first_failure = lives.min(axis=1)
+        delays = delay_sampler.sample(m, rng)
+
+        cycle_life = np.cumsum(first_failure) + cumulative_life
+        cycle_downtime = delays + REPLACEMENT_TIME_PER_SET
+        cycle_cost = (NUM_BEARINGS * BEARING_COST
+                      + cycle_downtime * DOWNTIME_COST_PER_MINUTE
+                      + REPLACEMENT_TIME_PER_SET / 60 * REPAIRPERSON_COST_PER_HOUR)
+
+        downtime.add(cycle_downtime, first_failure)
+        cost.add(cycle_cost, first_failure)
+        cumulative_life = int(cycle_life[-1])
+        total_delay += int(delays.sum())
+
+        if len(head_rows) < head:
+            take = min(head - len(head_rows), m)
+            head_rows.extend(np.column_stack((lives[:take], first_failure[:take],
+                                              cycle_life[:take], delays[:take])).tolist())
+
+    total_replacement_time = n_cycles * REPLACEMENT_TIME_PER_SET
+    return {
+        'cycles': n_cycles,
+        'cumulative_life': cumulative_life,
+        'total_delay': total_delay,
+        'total_bearing_replacements': n_cycles * NUM_BEARINGS,
+        'total_replacement_time': total_replacement_time,
+        'total_downtime': total_delay + total_replacement_time,
+        'downtime_per_1000_hours': downtime.estimate(),
+        'downtime_half_width': downtime.half_width(),
+        'cost_per_1000_hours': cost.estimate(),
+        'cost_half_width': cost.half_width(),
+        'head_rows': head_rows
+    }
+
+
+def main():
+    n_cycles = int(input("Enter the number of replacement cycles (default 10000000): ") or "10000000")
+    results = simulate_replacement_cycles(n_cycles)
+
+    print(f"\nFirst {len(results['head_rows'])} Replacement Cycles:")
+    headers = ["Bearing 1 Life (Hrs.)", "Bearing 2 Life (Hrs.)", "Bearing 3 Life (Hrs.)", "First Failure (Hrs.)",
+               "Cumulated Life (Hrs.)", "Delay (Minutes)"]
+    print(tabulate(results['head_rows'], headers=headers, tablefmt="grid"))
+
+    print("\nSummary of Simulation:")
+    print(f"Replacement Cycles: {results['cycles']}")
+    print(f"Cumulated Life: {results['cumulative_life']} hours")
+    print(f"Total Delay Time: {results['total_delay']} minutes")
+    print(f"Total Bearing Replacements: {results['total_bearing_replacements']}")
+    print(f"Total Replacement Time: {results['total_replacement_time']} minutes")
+    print(f"Total Downtime: {results['total_downtime']} minutes")
+    print(f"Downtime per 1000 Hours: {results['downtime_per_1000_hours']:.4f} "
+          f"± {results['downtime_half_width']:.4f} minutes (95% CI)")
+    print(f"Cost per 1000 Hours: {results['cost_per_1000_hours']:.2f} "
+          f"± {results['cost_half_width']:.2f} (95% CI)")
+
+
+if __name__ == "__main__":
+    main()
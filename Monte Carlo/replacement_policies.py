@@ -0,0 +1,154 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from tabulate import tabulate
+from discrete_sampler import DiscreteDistribution
+from reliability_engine import (bearing_life_distribution, delay_distribution, NUM_BEARINGS, BEARING_COST,
+                                DOWNTIME_COST_PER_MINUTE, REPAIRPERSON_COST_PER_HOUR, Z_95)
+
+# Minutes to replace one, two or three bearings at once
+INSTALL_MINUTES = {1: 20, 2: 30, 3: 40}
+
+# (name, kind, scheduled interval in hours)
+POLICIES = [
+    ("Replace all at first failure", "all", None),
+    ("Replace failed bearing only", "failed", None),
+    ("Scheduled every 800 hrs", "scheduled", 800),
+    ("Scheduled every 1000 hrs", "scheduled", 1000),
+    ("Scheduled every 1200 hrs", "scheduled", 1200),
+]
+
+
+def replacement_cost(bearings, delay_minutes):
+    install = INSTALL_MINUTES[bearings]
+    downtime = delay_minutes + install
+    return (bearings * BEARING_COST + downtime * DOWNTIME_COST_PER_MINUTE
+            + install / 60 * REPAIRPERSON_COST_PER_HOUR)
+
+
+def simulate_policy(lives, delays, horizon, kind, interval=None):
+    """
+    Cost per 1000 hours of one policy over `horizon` machine hours.
+
+    lives[j] is the stream of lives for bearing slot j and delays the stream of
+    repair delays; every policy consumes them in the same order (the k-th
+    bearing fitted in slot j always gets lives[j][k]), which gives the common
+    random numbers across policies. A scheduled replacement is planned, so it
+    has no repair delay.
+
+    The bearings in place at the horizon are charged pro rata: the run goes
+    on until each of them has been replaced, and each gets its share of that
+    replacement's cost times the fraction of its life that falls inside the
+    horizon. Leaving those costs out while counting their hours would bias
+    the estimate low by about half a cycle's cost over the horizon.
+    """
+    next_life = [1] * NUM_BEARINGS
+    expiry = [lives[j][0] for j in range(NUM_BEARINGS)]
+    fitted = [0.0] * NUM_BEARINGS
+    censored = None  # Slots whose bearing from before the horizon has not been replaced yet
+    next_delay = 0
+    next_scheduled = interval if kind == "scheduled" else float('inf')
+    cost = 0.0
+
+    while censored is None or censored:
+        failure_time = min(expiry)
+        if next_scheduled < failure_time:
+            now = next_scheduled
+            replace = range(NUM_BEARINGS)
+            event_cost = replacement_cost(NUM_BEARINGS, 0)
+            next_scheduled += interval
+        else:
+            now = failure_time
+            if kind == "all":
+                replace = range(NUM_BEARINGS)
+            else:
+                replace = [j for j in range(NUM_BEARINGS) if expiry[j] == failure_time]
+            event_cost = replacement_cost(len(replace), delays[next_delay])
+            next_delay += 1
+
+        if now < horizon:
+            cost += event_cost
+        else:
+            if censored is None:
+                censored = set(range(NUM_BEARINGS))
+            for j in censored.intersection(replace):
+                cost += event_cost / len(replace) * (horizon - fitted[j]) / (now - fitted[j])
+                censored.discard(j)
+
+        for j in replace:
+            fitted[j] = now
+            expiry[j] = now + lives[j][next_life[j]]
+            next_life[j] += 1
+
+    return 1000 * cost / horizon
+
+
+def _run_replications(seeds, horizon, policies):
+    # Worker task: every replication runs every policy on the same random streams
+    bearing_sampler = DiscreteDistribution(bearing_life_distribution)
+    delay_sampler = DiscreteDistribution(delay_distribution)
+    # A slot is refitted at most once per failure plus once per scheduled replacement, and the run goes
+    # on for at most one longest life past the horizon
+    min_life = min(life for life, _ in bearing_life_distribution)
+    max_life = max(life for life, _ in bearing_life_distribution)
+    shortest_interval = min([interval for _, kind, interval in policies if kind == "scheduled"] + [float('inf')])
+    stream_length = int((horizon + max_life) / min_life + (horizon + max_life) / shortest_interval) + 3
+
+    results = np.empty((len(seeds), len(policies)))
+    for r, seed in enumerate(seeds):
+        rng = np.random.default_rng(seed)
+        lives = bearing_sampler.sample((NUM_BEARINGS, stream_length), rng).tolist()
+        delays = delay_sampler.sample(NUM_BEARINGS * stream_length, rng).tolist()
+        for p, (_, kind, interval) in enumerate(policies):
+            results[r, p] = simulate_policy(lives, delays, horizon, kind, interval)
+    return results
+
+
+def compare_policies(policies=POLICIES, replications=2000, horizon=20000, seed=None, workers=None, batch_size=100):
+    """
+    Run `replications` common-random-number replications of every policy on a process pool.
+
+    Returns:
+        (rows, costs): ranked table rows and the (replications, policies) cost matrix
+    """
+    child_seeds = np.random.SeedSequence(seed).spawn(replications)
+    batches = [child_seeds[i:i + batch_size] for i in range(0, replications, batch_size)]
+    workers = workers or os.cpu_count()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = pool.map(_run_replications, batches, [horizon] * len(batches), [policies] * len(batches))
+        costs = np.vstack(list(parts))
+
+    means = costs.mean(axis=0)
+    order = np.argsort(means)
+    best = order[0]
+    n = len(costs)
+
+    rows = []
+    for rank, p in enumerate(order, 1):
+        half_width = Z_95 * costs[:, p].std(ddof=1) / np.sqrt(n)
+        if p == best:
+            rows.append([rank, policies[p][0], f"{means[p]:.2f} ± {half_width:.2f}", "-", "-"])
+            continue
+        difference = costs[:, p] - costs[:, best]
+        paired = Z_95 * difference.std(ddof=1) / np.sqrt(n)
+        unpaired = Z_95 * np.sqrt((costs[:, p].var(ddof=1) + costs[:, best].var(ddof=1)) / n)
+        rows.append([rank, policies[p][0], f"{means[p]:.2f} ± {half_width:.2f}",
+                     f"{difference.mean():+.2f} ± {paired:.2f}", f"± {unpaired:.2f}"])
+    return rows, costs
+
+
+def main():
+    replications = int(input("Enter the number of replications (default 2000): ") or "2000")
+    horizon = float(input("Enter the horizon in machine hours (default 20000): ") or "20000")
+
+    rows, _ = compare_policies(replications=replications, horizon=horizon)
+
+    print(f"\nReplacement Policy Comparison ({replications} replications of {horizon:g} hours, 95% CI; "
+          f"bearings in place at the horizon charged pro rata)")
+    headers = ["Rank", "Policy", "Cost per 1000 Hrs.", "Difference vs Best (paired)", "Unpaired CI"]
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+
+
+if __name__ == "__main__":
+    main()
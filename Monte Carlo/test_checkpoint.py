@@ -0,0 +1,43 @@
+import json
+import os
+import numpy as np
+from checkpoint import HEADER_FILE, ColumnarCheckpoint
+
+COLUMNS = ["iteration", "bearing_life"]
+
+
+def test_repeated_saves_keep_a_logarithmic_number_of_chunks(tmp_path):
+    rows = np.arange(2000, dtype=np.int64).reshape(-1, 2)
+    for step in range(1000):
+        checkpoint = ColumnarCheckpoint(tmp_path, COLUMNS)
+        checkpoint.append(rows[step:step + 1], {"saves": step + 1})
+
+    checkpoint = ColumnarCheckpoint(tmp_path, COLUMNS)
+    assert checkpoint.num_rows == 1000 and checkpoint.totals == {"saves": 1000}
+    assert len(checkpoint.chunk_rows) <= 11
+    assert len(os.listdir(tmp_path)) == 1 + len(COLUMNS) * len(checkpoint.chunk_rows)
+    assert np.array_equal(checkpoint.read_rows(), rows.tolist())
+    assert np.array_equal(checkpoint.read(123, 789)["bearing_life"], rows[123:789, 1])
+
+
+def test_headers_without_chunk_ids_still_load(tmp_path):
+    for chunk, part in enumerate(([[1, 2], [3, 4]], [[5, 6]])):
+        for j, column in enumerate(COLUMNS):
+            np.save(tmp_path / f"{column}_{chunk:06d}.npy", np.array(part, dtype=np.int64)[:, j])
+    with open(tmp_path / HEADER_FILE, "w") as file:
+        json.dump({"columns": COLUMNS, "totals": {}, "chunk_rows": [2, 1]}, file)
+
+    checkpoint = ColumnarCheckpoint(tmp_path, COLUMNS)
+    checkpoint.append([[7, 8]], {})
+    assert ColumnarCheckpoint(tmp_path, COLUMNS).read_rows() == [[1, 2], [3, 4], [5, 6], [7, 8]]
+
+
+def test_load_removes_chunks_left_by_an_interrupted_merge(tmp_path):
+    checkpoint = ColumnarCheckpoint(tmp_path, COLUMNS)
+    checkpoint.append([[1, 2]], {})
+    for column in COLUMNS:
+        np.save(tmp_path / f"{column}_000007.npy", np.zeros(3, dtype=np.int64))
+
+    checkpoint = ColumnarCheckpoint(tmp_path, COLUMNS)
+    assert sorted(os.listdir(tmp_path)) == sorted([HEADER_FILE] + [f"{c}_000000.npy" for c in COLUMNS])
+    assert checkpoint.read_rows() == [[1, 2]]
@@ -0,0 +1,27 @@
+import numpy as np
+from queue_network import jackson_analytic, simulate_jackson, simulate_tandem
+from reliability_engine import Z_95
+
+NUM_CUSTOMERS = 100_000
+SEEDS = range(1, 13)
+
+
+def assert_within_ci(values, exact):
+    values = np.asarray(values)
+    half_width = Z_95 * values.std(ddof=1) / np.sqrt(len(values))
+    assert abs(values.mean() - exact) <= half_width, (values.mean(), half_width, exact)
+
+
+def test_tandem_matches_burke():
+    # Three stations need four substreams, the case where evenly spaced LCG seeds were correlated
+    mean_service_times = np.array([0.5, 0.6, 0.7])
+    values = [simulate_tandem(1.0, mean_service_times, NUM_CUSTOMERS, seed=seed)["network"]["Average Time in System"]
+              for seed in SEEDS]
+    assert_within_ci(values, np.sum(mean_service_times / (1 - mean_service_times)))
+
+
+def test_jackson_network_with_feedback_matches_product_form():
+    gamma, mu, routing = [0.5, 0.2, 0.0], [1.6, 1.0, 1.2], [[0.0, 0.6, 0.2], [0.1, 0.0, 0.5], [0.2, 0.0, 0.0]]
+    values = [simulate_jackson(gamma, mu, routing, NUM_CUSTOMERS // 2, seed=seed)["network"]["Average Time in System"]
+              for seed in SEEDS[:6]]
+    assert_within_ci(values, jackson_analytic(gamma, mu, routing)["time_in_system"])
@@ -0,0 +1,20 @@
+from replacement_policies import NUM_BEARINGS, replacement_cost, simulate_policy
+
+
+def test_scheduled_policy_charges_the_cycle_cut_by_the_horizon():
+    # Lives longer than the interval: only scheduled replacements happen, one every 1000 hours
+    lives = [[1500] * 40 for _ in range(NUM_BEARINGS)]
+    delays = [6] * 120
+    rate = replacement_cost(NUM_BEARINGS, 0)
+    for horizon in (20000, 20500, 20999):
+        assert abs(simulate_policy(lives, delays, horizon, "scheduled", 1000) - rate) < 1e-9
+
+
+def test_failure_policies_charge_the_bearings_in_place_at_the_horizon():
+    # Constant lives: every policy replaces all three bearings every 1000 hours
+    lives = [[1000] * 40 for _ in range(NUM_BEARINGS)]
+    delays = [6] * 120
+    rate = replacement_cost(NUM_BEARINGS, 6)
+    for kind in ("all", "failed"):
+        for horizon in (20000, 20250):
+            assert abs(simulate_policy(lives, delays, horizon, kind) - rate) < 1e-9
@@ -0,0 +1,225 @@
+import csv
+import os
+import sys
+import tempfile
+import time
+from itertools import islice
+import numpy as np
+from numpy.lib import format as npy_format
+from tabulate import tabulate
+from lindley import run_blocks
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "random numbers"))
+from variates import LCGStream, VariateGenerator
+
+HEADER_SIZE = 128  # Fixed .npy header so the final shape can be patched in place
+
+
+def open_column(path, dtype=np.float64):
+    """
+    Memory-map one column of a trace read-only.
+
+    .npy files carry their own dtype and shape; anything else is read as a
+    flat raw binary array of `dtype`. Nothing is loaded until it is sliced.
+    """
+    if str(path).endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+class NpyColumnWriter:
+    """
+    Append-only writer for a 1-D .npy file whose length is not known in advance.
+
+    A header with a placeholder shape is written first, chunks are appended
+    as raw bytes and close() rewrites the header with the final length, so
+    the file can be far larger than memory.
+    """
+
+    def __init__(self, path, dtype=np.float64):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.length = 0
+        self.file = open(path, "wb")
+        self._write_header()
+
+    def _write_header(self):
+        header = {"descr": npy_format.dtype_to_descr(self.dtype), "fortran_order": False, "shape": (self.length,)}
+        text = repr(header).encode("latin1")
+        prefix = b"\x93NUMPY\x01\x00"
+        padding = HEADER_SIZE - len(prefix) - 2 - len(text) - 1
+        self.file.write(prefix + np.uint16(HEADER_SIZE - len(prefix) - 2).tobytes() + text + b" " * padding + b"\n")
+
+    def append(self, values):
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        self.file.write(values.tobytes())
+        self.length += len(values)
+
+    def close(self):
+        self.file.seek(0)
+        self._write_header()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def csv_to_columns(csv_path, out_dir, service_column="service", inter_arrival_column=None,
+                   arrival_time_column="arrival_time", delimiter=",", chunk_rows=1_000_000):
+    """
+    Convert a CSV request log into inter_arrivals.npy and services.npy in `out_dir`.
+
+    Columns are looked up by header name. With inter_arrival_column the gaps
+    are taken as they are; otherwise they are the differences of the
+    arrival_time_column, with the clock starting at the first request.
+    The file is read chunk_rows rows at a time, so the log never has to fit
+    in memory and cannot be sorted here: a negative gap, i.e. arrival times
+    out of order, raises ValueError.
+
+    Returns:
+        Tuple of the two output paths and the number of rows
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    inter_arrival_path = os.path.join(out_dir, "inter_arrivals.npy")
+    service_path = os.path.join(out_dir, "services.npy")
+
+    with open(csv_path, newline="") as f, NpyColumnWriter(inter_arrival_path) as gaps, \
+            NpyColumnWriter(service_path) as services:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader)
+        time_index = header.index(inter_arrival_column or arrival_time_column)
+        service_index = header.index(service_column)
+        previous_arrival = None
+        first_row = 2  # File line of the first row in the chunk, after the header
+
+        while True:
+            rows = list(islice(reader, chunk_rows))
+            if not rows:
+                break
+            times = np.array([row[time_index] for row in rows], dtype=np.float64)
+            services.append(np.array([row[service_index] for row in rows], dtype=np.float64))
+
+            if inter_arrival_column is None:
+                if previous_arrival is None:
+                    previous_arrival = times[0]
+                gap = np.diff(times, prepend=previous_arrival)
+                previous_arrival = times[-1]
+            else:
+                gap = times
+            negative = np.flatnonzero(gap < 0)
+            if len(negative):
+                raise ValueError(f"negative inter-arrival time on line {first_row + negative[0]} of {csv_path}"
+                                 + ("" if inter_arrival_column else f", {arrival_time_column} must be sorted"))
+            gaps.append(gap)
+            first_row += len(rows)
+
+    return inter_arrival_path, service_path, services.length
+
+
+def simulate_trace(inter_arrivals, services, chunk_size=1_000_000, start=0, stop=None, on_progress=None):
+    """
+    Replay a recorded trace through a single FIFO server (trace-driven G/G/1).
+
+    inter_arrivals and services are paths (see open_column) or arrays;
+    customers start:stop are pushed through lindley.run_blocks chunk_size at a
+    time, so only one chunk of each column is ever resident in memory however
+    large the files are. Progress events are those of lindley.simulate_mm1.
+    An empty selection raises ValueError.
+
+    Returns:
+        Dictionary with the same keys as lindley.simulate_mm1
+    """
+    if isinstance(inter_arrivals, (str, os.PathLike)):
+        inter_arrivals = open_column(inter_arrivals)
+    if isinstance(services, (str, os.PathLike)):
+        services = open_column(services)
+    length = min(len(inter_arrivals), len(services))
+    stop = length if stop is None else min(stop, length)
+    if not 0 <= start < stop:
+        raise ValueError(f"customers {start}:{stop} of a {length}-customer trace are an empty selection")
+
+    def blocks():
+        for first in range(start, stop, chunk_size):
+            last = min(first + chunk_size, stop)
+            yield np.array(inter_arrivals[first:last], dtype=np.float64), np.array(services[first:last], dtype=np.float64)
+
+    return run_blocks(blocks(), stop - start, on_progress)
+
+
+class ColumnReader:
+    """
+    Callable that returns the next value of a memory-mapped column, for engines that draw one time per event.
+
+    Values are copied out chunk_size at a time, so an instance can stand in
+    for a variate generator, e.g. as the inter_arrival or service argument of
+    multi_server.GGcQueue. Raises EOFError once the column is used up.
+    """
+
+    def __init__(self, column, chunk_size=65536, start=0):
+        self.column = open_column(column) if isinstance(column, (str, os.PathLike)) else column
+        self.chunk_size = chunk_size
+        self.position = start
+        self.buffer = []
+
+    def __call__(self):
+        if not self.buffer:
+            chunk = self.column[self.position:self.position + self.chunk_size]
+            if len(chunk) == 0:
+                raise EOFError("trace exhausted")
+            self.position += len(chunk)
+            self.buffer = np.array(chunk, dtype=np.float64).tolist()[::-1]
+        return self.buffer.pop()
+
+
+def write_demo_log(path, num_requests, mean_inter_arrival, mean_service_time, seed=1, chunk_rows=100_000):
+    """Synthetic request log with Poisson arrivals, in the CSV layout of a production access log."""
+    variates = VariateGenerator(LCGStream(seed).uniforms)
+    clock = 0.0
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["arrival_time", "service"])
+        for first in range(0, num_requests, chunk_rows):
+            m = min(chunk_rows, num_requests - first)
+            arrivals = clock + np.cumsum(variates.exponential(m, mean_inter_arrival))
+            clock = arrivals[-1]
+            writer.writerows(zip(arrivals.tolist(), variates.exponential(m, mean_service_time).tolist()))
+
+
+def main():
+    mean_inter_arrival, mean_service_time, num_requests = 1.0, 0.8, 1_000_000
+    rho = mean_service_time / mean_inter_arrival
+
+    with tempfile.TemporaryDirectory() as directory:
+        log_path = os.path.join(directory, "requests.csv")
+        write_demo_log(log_path, num_requests, mean_inter_arrival, mean_service_time)
+
+        start = time.perf_counter()
+        inter_arrival_path, service_path, rows = csv_to_columns(log_path, directory)
+        convert_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = simulate_trace(inter_arrival_path, service_path)
+        simulate_time = time.perf_counter() - start
+
+        csv_size = os.path.getsize(log_path)
+        column_size = os.path.getsize(inter_arrival_path) + os.path.getsize(service_path)
+
+    expected = {
+        "Average Delay in Queue": rho * mean_service_time / (1 - rho),
+        "Average Number in Queue": rho ** 2 / (1 - rho),
+        "Server Utilization": rho,
+    }
+    rows_out = [[name, f"{value:.4f}", f"{expected[name]:.4f}" if name in expected else "-"]
+                for name, value in results.items()]
+    print(f"Replayed {rows} requests from a {csv_size / 2**20:.1f} MiB CSV log "
+          f"({column_size / 2**20:.1f} MiB of columns)\n")
+    print(tabulate(rows_out, headers=["Statistic", "Trace", "M/M/1"], tablefmt="grid"))
+    print(f"\nCSV conversion {convert_time:.2f} s ({rows / convert_time:,.0f} rows/s), "
+          f"replay {simulate_time:.2f} s ({rows / simulate_time:,.0f} customers/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+from tabulate import tabulate
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Model modules that batch workers import; none of them may pull in a GUI or plotting backend
+MODULES = {
+    "Monte Carlo": [
+        "answer3",
+        "bomber",
+        "checkpoint",
+        "discrete_sampler",
+        "fft_kde",
+        "gambling",
+        "irregular",
+        "lindley",
+        "load_sweep",
+        "markov_game",
+        "normal_distribution",
+        "numerical",
+        "pi",
+        "queue_network",
+        "random_walk",
+        "random_walk_ensemble",
+        "reliability",
+        "reliability_engine",
+        "replacement_policies",
+        "trace_queue",
+    ],
+    "exam": [
+        "answer10",
+        "answer7",
+        "answer9",
+        "downsample",
+        "event_kernel",
+        "multi_server",
+        "offline_render",
+        "online_stats",
+        "pursuit_adaptive",
+        "pursuit_batch",
+        "rare_event",
+        "replications",
+        "trajectory_store",
+    ],
+    "random numbers": [
+        "variates",
+    ],
+}
+GUI_BACKENDS = ["matplotlib", "tkinter", "pygame", "seaborn"]
+IMPORT_BUDGET = 0.5  # seconds
+
+# Run in a fresh interpreter so every module pays its own import cost
+PROBE = """
+import sys, time
+start = time.perf_counter()
+__import__({module!r})
+elapsed = time.perf_counter() - start
+loaded = [name for name in {backends!r} if name in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def measure_import(directory, module):
+    code = PROBE.format(module=module, backends=GUI_BACKENDS)
+    env = dict(os.environ, MPLBACKEND="Agg")
+    env.pop("DISPLAY", None)
+    result = subprocess.run([sys.executable, "-c", code], cwd=os.path.join(ROOT, directory), env=env,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1]
+    elapsed, _, loaded = result.stdout.strip().splitlines()[-1].partition(" ")
+    return float(elapsed), loaded
+
+
+def main():
+    rows = []
+    failures = 0
+    for directory, modules in MODULES.items():
+        for module in modules:
+            elapsed, loaded = measure_import(directory, module)
+            if elapsed is None:
+                status = f"ERROR: {loaded}"
+            elif loaded:
+                status = f"loads {loaded}"
+            elif elapsed > IMPORT_BUDGET:
+                status = "over budget"
+            else:
+                status = "ok"
+            failures += status != "ok"
+            rows.append([f"{directory}/{module}.py", "-" if elapsed is None else f"{elapsed:.3f}", status])
+
+    print(tabulate(rows, headers=["Module", "Import Time (s)", "Status"], tablefmt="grid"))
+    print(f"\nBudget: {IMPORT_BUDGET} s per module, {failures} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
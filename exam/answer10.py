@@ -1,5 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
 class LinearCongruentialGenerator:
     def __init__(self, seed, multiplier, increment, modulus):
@@ -17,6 +16,8 @@ class LinearCongruentialGenerator:
         return self.generated_numbers
 
     def plot_distribution(self):
+        import matplotlib.pyplot as plt
+
         plt.ion()
         plt.figure(figsize=(12, 6))
         
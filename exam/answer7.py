@@ -1,10 +1,9 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
 from tabulate import tabulate
+from trajectory_store import TrajectoryStore
 
 class CircularChessSimulation:
-    def __init__(self, n_entities, max_steps=1000, dt=0.01):
+    def __init__(self, n_entities, max_steps=1000, dt=0.01, keep_every=1, history_frames=None, history_path=None):
         self.n_entities = n_entities
         self.max_steps = max_steps
         self.dt = dt
@@ -13,7 +12,11 @@ class CircularChessSimulation:
         angles = np.linspace(0, 2*np.pi, n_entities, endpoint=False)
         self.positions = np.column_stack((np.cos(angles), np.sin(angles)))
         
-        self.history = [self.positions.copy()]
+        # Decimated float32 history; by default room for every kept frame plus the final one
+        if history_frames is None:
+            history_frames = max_steps // keep_every + 2
+        self.history = TrajectoryStore(self.positions.shape, history_frames, keep_every, history_path)
+        self.history.append(self.positions)
         
     def update_positions(self):
         next_positions = np.roll(self.positions, -1, axis=0)
@@ -23,7 +26,7 @@ class CircularChessSimulation:
         directions = directions / distances[:, np.newaxis]
         self.positions += directions * self.dt
         
-        self.history.append(self.positions.copy())
+        self.history.append(self.positions)
         
     def check_convergence(self):
         distances = np.linalg.norm(self.positions - self.positions[0], axis=1)
@@ -67,11 +70,38 @@ class CircularChessSimulation:
         if step >= self.max_steps:
             print(f"\nMaximum iterations ({self.max_steps}) reached without convergence")
             print(f"Final maximum distance between nodes: {max_distance:.6f}")
-            
+
+        self.history.finish(self.positions)
+        self.history.flush()
         return step
     
+    def run_adaptive(self, rtol=1e-6):
+        """Integrate with adaptive Dormand-Prince steps until convergence; returns the integrator's summary."""
+        from pursuit_adaptive import integrate_adaptive
+
+        def record(t, positions):
+            self.positions = positions
+            self.history.append(positions)
+
+        result = integrate_adaptive(self.positions, self.convergence_threshold, rtol=rtol, max_steps=self.max_steps,
+                                    on_step=record)
+        print(f"\nAdaptive integration {'converged' if result['converged'] else 'stopped'} at t = "
+              f"{result['time']:.6f} after {result['steps']} steps ({result['rejected']} rejected)")
+        self.history.finish(self.positions)
+        self.history.flush()
+        return result
+
+    def render(self, output, duration=10.0, fps=30, workers=None):
+        """Render the recorded history offline (video file or PNG directory) without a display."""
+        from offline_render import PursuitScene, render
+
+        return render(PursuitScene.from_store(self.history), output, duration, fps, workers=workers)
+
     def animate(self):
-        history = np.array(self.history)
+        import matplotlib.pyplot as plt
+        from matplotlib.animation import FuncAnimation
+
+        history = self.history
         
         fig, ax = plt.subplots(figsize=(8, 8))
         ax.set_xlim(-1.2, 1.2)
@@ -102,9 +132,14 @@ def main():
     n_entities = int(input("Enter number of entities: "))
     max_steps = int(input("Enter maximum number of steps (default 1000): ") or "1000")
     dt = float(input("Enter time step (default 0.01): ") or "0.01")
+    keep_every = int(input("Keep every k-th frame for the animation (default 1): ") or "1")
+    adaptive = (input("Use adaptive time steps? (y/N): ") or "n").lower().startswith("y")
     
-    sim = CircularChessSimulation(n_entities, max_steps, dt)
-    steps = sim.run_simulation()
+    sim = CircularChessSimulation(n_entities, max_steps, dt, keep_every)
+    if adaptive:
+        steps = sim.run_adaptive()["steps"]
+    else:
+        steps = sim.run_simulation()
     
     print(f"\nSimulation completed in {steps} steps")
     print("Displaying animation...")
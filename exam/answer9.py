@@ -1,216 +1,300 @@
+import math
+import os
+import sys
+from collections import deque
 import numpy as np
-import random
-from typing import List, Tuple
-import tkinter as tk
-from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import matplotlib.animation as animation
-
-class Customer:
-    def __init__(self, arrival_time: float):
-        self.arrival_time = arrival_time
-        self.service_start_time = 0.0
-        self.service_end_time = 0.0
-        self.service_time = 0.0
-        self.waiting_time = 0.0
-
-class MM1Queue:
-    def __init__(self, mean_inter_arrival_time: float, mean_service_time: float, max_customers: int):
+from event_kernel import ARRIVAL, DEPARTURE, EventScheduler, SteppableModel
+from online_stats import P2Quantile, RunningMoments, TimeWeightedAverage
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "random numbers"))
+from variates import LCGStream, VariateGenerator
+
+class GrowableArray:
+    """
+    One-dimensional NumPy column with cheap appends.
+
+    Appended values collect in a short Python list and are flushed into the
+    array in blocks, so the hot loop pays a list append rather than a NumPy
+    scalar store; the array doubles its capacity when full.
+    """
+
+    def __init__(self, dtype=float, capacity=1024, fill=0, block_size=4096):
+        self._data = np.full(capacity, fill, dtype=dtype)
+        self._size = 0
+        self._pending = []
+        self.fill = fill
+        self.block_size = block_size
+
+    def append(self, value):
+        pending = self._pending
+        pending.append(value)
+        if len(pending) >= self.block_size:
+            self.flush()
+
+    def flush(self):
+        count = len(self._pending)
+        if count:
+            self.reserve(self._size + count)
+            self._data[self._size:self._size + count] = self._pending
+            self._size += count
+            self._pending.clear()
+
+    def reserve(self, capacity):
+        if capacity > len(self._data):
+            data = np.full(max(capacity, 2 * len(self._data)), self.fill, dtype=self._data.dtype)
+            data[:self._size] = self._data[:self._size]
+            self._data = data
+
+    @property
+    def values(self) -> np.ndarray:
+        """View of the filled part of the column (no copy)."""
+        self.flush()
+        return self._data[:self._size]
+
+    def __len__(self):
+        return self._size + len(self._pending)
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+
+class CustomerTable:
+    """
+    Customers stored as struct-of-arrays: one float64 column per attribute.
+
+    Row i is the i-th arrival. A customer costs 32 bytes instead of a Python
+    object with its own __dict__, and statistics reduce whole columns at once.
+    The server is FIFO, so customers start service in arrival order and the
+    service columns are simply the prefix of rows that have reached the server.
+    """
+
+    def __init__(self, capacity=1024):
+        self.arrival_time = GrowableArray(float, capacity)
+        self.service_start_time = GrowableArray(float, capacity)
+        self.service_end_time = GrowableArray(float, capacity)
+        self.service_time = GrowableArray(float, capacity)
+
+    def add(self, arrival_time: float):
+        self.arrival_time.append(arrival_time)
+
+    def start_service(self, start_time: float, service_time: float) -> float:
+        """Start service for the next customer in line; returns its departure time."""
+        end_time = start_time + service_time
+        self.service_start_time.append(start_time)
+        self.service_end_time.append(end_time)
+        self.service_time.append(service_time)
+        return end_time
+
+    def __len__(self):
+        return len(self.arrival_time)
+
+
+class MM1Queue(SteppableModel):
+    """
+    M/M/1 queue on the event kernel.
+
+    With trace=True every customer and every event is kept in NumPy columns
+    for plotting and exact statistics. With trace=False only running
+    accumulators are kept (time-weighted queue length and server status,
+    Welford moments and P² quantiles of the delay), so memory is bounded by
+    the longest queue instead of growing with every event. Each P² quantile
+    costs about a microsecond per customer; pass fewer delay_quantiles for
+    the fastest untraced runs. step(), run_until(), snapshot() and restore()
+    come from SteppableModel.
+    """
+
+    def __init__(self, mean_inter_arrival_time: float, mean_service_time: float, max_customers: int,
+                 seed: int = None, trace: bool = True, delay_quantiles=(0.5, 0.9, 0.99)):
         self.mean_inter_arrival_time = mean_inter_arrival_time
         self.mean_service_time = mean_service_time
         self.max_customers = max_customers
-        self.customers: List[Customer] = []
+        self.trace = trace
+        self.delay_quantile_levels = tuple(delay_quantiles)
         self.current_time = 0.0
         self.server_busy = False
         self.queue_length = 0
+        self.waiting = deque()  # Arrival times of the customers in line
         self.total_waiting_time = 0.0
         self.total_service_time = 0.0
         self.total_customers_served = 0
-        self.queue_history = []
-        self.time_history = []
-        self.server_status_history = []
+        self.started = False
+        self.variates = VariateGenerator(LCGStream(seed).uniforms)
+        self.scheduler = EventScheduler()
+
+        if trace:
+            # Arrivals rarely run far ahead of departures, so a little headroom avoids most regrowth;
+            # very long runs start smaller and grow by doubling
+            capacity = min(max_customers + max_customers // 8 + 16, 1 << 22)
+            self.customers = CustomerTable(capacity)
+            # One entry per event, i.e. two per customer
+            self.queue_history = GrowableArray(np.int32, 2 * capacity)
+            self.time_history = GrowableArray(np.float64, 2 * capacity)
+            self.server_status_history = GrowableArray(np.int8, 2 * capacity)
+            self._record_queue = self.queue_history.append
+            self._record_time = self.time_history.append
+            self._record_status = self.server_status_history.append
+        else:
+            self.customers = self.queue_history = self.time_history = self.server_status_history = None
+            self.queue_stat = TimeWeightedAverage()
+            self.server_stat = TimeWeightedAverage()
+            self.delay_stats = RunningMoments()
+            self.delay_quantiles = [P2Quantile(p) for p in self.delay_quantile_levels]
+
+    def reseed(self, seed, buffer_size=None):
+        """Continue on a fresh random number stream, e.g. in clones restored from one snapshot."""
+        self.variates = VariateGenerator(LCGStream(seed).uniforms, buffer_size or self.variates.buffer_size)
 
     def generate_inter_arrival_time(self) -> float:
-        return -self.mean_inter_arrival_time * np.log(random.random())
+        return self.variates.next_exponential(self.mean_inter_arrival_time)
 
     def generate_service_time(self) -> float:
-        return -self.mean_service_time * np.log(random.random())
-
-    def run_simulation(self):
-        next_arrival_time = self.generate_inter_arrival_time()
-        next_service_end_time = float('inf')
-        
-        while self.total_customers_served < self.max_customers:
-            if next_arrival_time < next_service_end_time:
-                self.current_time = next_arrival_time
-                customer = Customer(self.current_time)
-                self.customers.append(customer)
-                
-                if not self.server_busy:
-                    self.server_busy = True
-                    customer.service_time = self.generate_service_time()
-                    customer.service_start_time = self.current_time
-                    customer.service_end_time = self.current_time + customer.service_time
-                    next_service_end_time = customer.service_end_time
-                else:
-                    self.queue_length += 1
-                
-                next_arrival_time = self.current_time + self.generate_inter_arrival_time()
-            else:
-                self.current_time = next_service_end_time
-                self.server_busy = False
-                self.total_customers_served += 1
-                
-                if self.queue_length > 0:
-                    self.queue_length -= 1
-                    self.server_busy = True
-                    customer = self.customers[self.total_customers_served]
-                    customer.service_time = self.generate_service_time()
-                    customer.service_start_time = self.current_time
-                    customer.service_end_time = self.current_time + customer.service_time
-                    next_service_end_time = customer.service_end_time
-                else:
-                    next_service_end_time = float('inf')
-            
-            self.queue_history.append(self.queue_length)
-            self.time_history.append(self.current_time)
-            self.server_status_history.append(1 if self.server_busy else 0)
+        return self.variates.next_exponential(self.mean_service_time)
 
+    def _record(self):
+        if self.trace:
+            self._record_queue(self.queue_length)
+            self._record_time(self.current_time)
+            self._record_status(self.server_busy)
+        else:
+            self.queue_stat.update(self.current_time, self.queue_length)
+            self.server_stat.update(self.current_time, self.server_busy)
+
+    def _start_service(self, arrival_time):
+        self.server_busy = True
+        service_time = self.generate_service_time()
+        if self.trace:
+            service_end_time = self.customers.start_service(self.current_time, service_time)
+        else:
+            service_end_time = self.current_time + service_time
+            delay = self.current_time - arrival_time
+            self.delay_stats.add(delay)
+            for quantile in self.delay_quantiles:
+                quantile.add(delay)
+        self.scheduler.schedule_at(service_end_time, DEPARTURE)
+
+    def _arrival(self, _):
+        self.current_time = self.scheduler.now
+        if self.trace:
+            self.customers.add(self.current_time)
+
+        if not self.server_busy:
+            self._start_service(self.current_time)
+        else:
+            self.queue_length += 1
+            self.waiting.append(self.current_time)
+
+        self.scheduler.schedule(self.generate_inter_arrival_time(), ARRIVAL)
+        self._record()
+
+    def _departure(self, _):
+        self.current_time = self.scheduler.now
+        self.server_busy = False
+        self.total_customers_served += 1
+
+        if self.queue_length > 0:
+            self.queue_length -= 1
+            self._start_service(self.waiting.popleft())
+
+        self._record()
+        if self.total_customers_served >= self.max_customers:
+            self.scheduler.stop()
+
+    @property
+    def finished(self):
+        return self.total_customers_served >= self.max_customers
+
+    def _handlers(self):
+        return [self._arrival, self._departure]
+
+    def _schedule_first_events(self):
+        self.scheduler.schedule(self.generate_inter_arrival_time(), ARRIVAL)
+
+    def run_until(self, end_time, cancel=None):
+        super().run_until(end_time, cancel)
+        self.current_time = self.scheduler.now  # The clock has moved on to end_time even without an event there
+
+    def run_simulation(self, on_progress=None, progress_every=None, cancel=None):
+        """
+        Serve max_customers customers, or stop early when `cancel` is cancelled, and return the statistics.
+
+        on_progress is a callable or a list of callables, as in
+        lindley.simulate_mm1. Between event batches, once at least
+        `progress_every` more departures have happened (default 1% of the
+        run), each subscriber receives a progress event dictionary with the
+        queue itself under "queue". Subscribers run on the simulation thread,
+        so they must only read. Results do not depend on the batching.
+        """
+        subscribers = [] if on_progress is None else on_progress if isinstance(on_progress, list) else [on_progress]
+        progress_every = progress_every or max(1000, self.max_customers // 100)
+        next_report = [self.total_customers_served + progress_every]
+
+        def report():
+            if subscribers and (self.total_customers_served >= next_report[0] or self.finished):
+                next_report[0] = self.total_customers_served + progress_every
+                event = {"customers": self.total_customers_served, "total": self.max_customers,
+                         "current_time": self.current_time, "queue": self}
+                for subscriber in subscribers:
+                    subscriber(event)
+
+        self.run(cancel, report)
         return self.calculate_statistics()
 
     def calculate_statistics(self):
-        total_waiting_time = 0.0
-        total_service_time = 0.0
-        total_customers = len(self.customers)
-
-        for customer in self.customers:
-            customer.waiting_time = customer.service_start_time - customer.arrival_time
-            total_waiting_time += customer.waiting_time
-            total_service_time += customer.service_time
-
-        avg_delay = total_waiting_time / total_customers
-        avg_queue_length = total_waiting_time / self.current_time
-        server_utilization = total_service_time / self.current_time
-
-        return {
-            'avg_delay': avg_delay,
-            'avg_queue_length': avg_queue_length,
-            'server_utilization': server_utilization,
-            'simulation_time': self.current_time
+        if not self.trace:
+            return self._online_statistics()
+
+        starts = self.customers.service_start_time.values
+        ends = self.customers.service_end_time.values
+        arrivals = self.customers.arrival_time.values
+        started = len(starts)
+        end_time = self.current_time
+
+        # Customers still in line at the end have no delay yet but add their partial wait to the queue area
+        waits = starts - arrivals[:started]
+        queue_area = waits.sum() + (end_time - arrivals[started:]).sum()
+        busy_time = (np.minimum(ends, end_time) - starts).sum()
+        self.total_waiting_time = float(waits.sum())
+        self.total_service_time = float(self.customers.service_time.values.sum())
+
+        # A run cancelled before anything happened reports zeros and nan quantiles, as _online_statistics does
+        stats = {
+            'avg_delay': float(waits.mean()) if started else 0.0,
+            'avg_queue_length': float(queue_area / end_time) if end_time > 0 else 0.0,
+            'server_utilization': float(busy_time / end_time) if end_time > 0 else 0.0,
+            'simulation_time': end_time,
+            'delay_std': float(waits.std(ddof=1)) if started > 1 else 0.0
         }
+        levels = self.delay_quantile_levels
+        quantiles = np.quantile(waits, levels) if started else [math.nan] * len(levels)
+        for p, value in zip(levels, quantiles):
+            stats[f'delay_p{round(100 * p)}'] = float(value)
+        return stats
+
+    def _online_statistics(self):
+        end_time = self.current_time
+        self.total_waiting_time = self.delay_stats.mean * self.delay_stats.count
+
+        stats = {
+            'avg_delay': self.delay_stats.mean,
+            'avg_queue_length': self.queue_stat.mean(end_time),
+            'server_utilization': self.server_stat.mean(end_time),
+            'simulation_time': end_time,
+            'delay_std': self.delay_stats.std
+        }
+        for quantile in self.delay_quantiles:
+            stats[f'delay_p{round(100 * quantile.p)}'] = quantile.value()
+        return stats
+
+def main(headless=False):
+    if headless:
+        stats = MM1Queue(2.0, 1.5, 1000).run_simulation()
+        for key, value in stats.items():
+            print(f"{key}: {value:.4f}")
+        return
 
-class QueueSimulationGUI:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("M/M/1 Queue Simulation")
-        self.main_frame = ttk.Frame(root, padding="10")
-        self.main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        self.create_parameter_frame()
-        self.create_plots()
-        self.create_control_buttons()
-        self.simulation = None
-        self.animation = None
-
-    def create_parameter_frame(self):
-        param_frame = ttk.LabelFrame(self.main_frame, text="Simulation Parameters", padding="5")
-        param_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
-        
-        self.mean_inter_arrival = tk.DoubleVar(value=2.0)
-        self.mean_service = tk.DoubleVar(value=1.5)
-        self.max_customers = tk.IntVar(value=1000)
-        
-        ttk.Label(param_frame, text="Mean Inter-arrival Time:").grid(row=0, column=0, sticky=tk.W)
-        ttk.Entry(param_frame, textvariable=self.mean_inter_arrival, width=10).grid(row=0, column=1, padx=5)
-        
-        ttk.Label(param_frame, text="Mean Service Time:").grid(row=1, column=0, sticky=tk.W)
-        ttk.Entry(param_frame, textvariable=self.mean_service, width=10).grid(row=1, column=1, padx=5)
-        
-        ttk.Label(param_frame, text="Max Customers:").grid(row=2, column=0, sticky=tk.W)
-        ttk.Entry(param_frame, textvariable=self.max_customers, width=10).grid(row=2, column=1, padx=5)
-
-    def create_plots(self):
-        self.fig = Figure(figsize=(10, 6))
-        
-        self.queue_ax = self.fig.add_subplot(211)
-        self.queue_ax.set_title("Queue Length Over Time")
-        self.queue_ax.set_xlabel("Time")
-        self.queue_ax.set_ylabel("Queue Length")
-        
-        self.server_ax = self.fig.add_subplot(212)
-        self.server_ax.set_title("Server Status Over Time")
-        self.server_ax.set_xlabel("Time")
-        self.server_ax.set_ylabel("Server Status (0=Idle, 1=Busy)")
-        
-        self.fig.tight_layout()
-        
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.main_frame)
-        self.canvas.get_tk_widget().grid(row=1, column=0, columnspan=2, pady=5)
-
-    def create_control_buttons(self):
-        button_frame = ttk.Frame(self.main_frame)
-        button_frame.grid(row=2, column=0, columnspan=2, pady=5)
-        
-        ttk.Button(button_frame, text="Run Simulation", command=self.run_simulation).grid(row=0, column=0, padx=5)
-        ttk.Button(button_frame, text="Stop", command=self.stop_simulation).grid(row=0, column=1, padx=5)
-
-    def run_simulation(self):
-        self.simulation = MM1Queue(
-            self.mean_inter_arrival.get(),
-            self.mean_service.get(),
-            self.max_customers.get()
-        )
-        
-        import threading
-        thread = threading.Thread(target=self.run_simulation_thread)
-        thread.start()
-
-    def run_simulation_thread(self):
-        stats = self.simulation.run_simulation()
-        
-        self.queue_ax.clear()
-        self.server_ax.clear()
-        
-        self.queue_ax.plot(self.simulation.time_history, self.simulation.queue_history)
-        self.server_ax.plot(self.simulation.time_history, self.simulation.server_status_history)
-        
-        self.queue_ax.set_title("Queue Length Over Time")
-        self.queue_ax.set_xlabel("Time")
-        self.queue_ax.set_ylabel("Queue Length")
-        
-        self.server_ax.set_title("Server Status Over Time")
-        self.server_ax.set_xlabel("Time")
-        self.server_ax.set_ylabel("Server Status (0=Idle, 1=Busy)")
-        
-        self.fig.tight_layout()
-        self.canvas.draw()
-        
-        self.show_statistics(stats)
-
-    def show_statistics(self, stats):
-        stats_window = tk.Toplevel(self.root)
-        stats_window.title("Simulation Results")
-        
-        ttk.Label(stats_window, text="M/M/1 Queue Simulation Results").grid(row=0, column=0, columnspan=2, pady=5)
-        ttk.Label(stats_window, text="-" * 40).grid(row=1, column=0, columnspan=2)
-        
-        ttk.Label(stats_window, text=f"Mean Inter-arrival Time: {self.mean_inter_arrival.get():.2f}").grid(row=2, column=0, columnspan=2, sticky=tk.W)
-        ttk.Label(stats_window, text=f"Mean Service Time: {self.mean_service.get():.2f}").grid(row=3, column=0, columnspan=2, sticky=tk.W)
-        ttk.Label(stats_window, text=f"Number of Customers: {self.max_customers.get()}").grid(row=4, column=0, columnspan=2, sticky=tk.W)
-        ttk.Label(stats_window, text=f"Simulation Time: {stats['simulation_time']:.2f}").grid(row=5, column=0, columnspan=2, sticky=tk.W)
-        ttk.Label(stats_window, text=f"Average Delay in Queue: {stats['avg_delay']:.2f}").grid(row=6, column=0, columnspan=2, sticky=tk.W)
-        ttk.Label(stats_window, text=f"Average Number in Queue: {stats['avg_queue_length']:.2f}").grid(row=7, column=0, columnspan=2, sticky=tk.W)
-        ttk.Label(stats_window, text=f"Server Utilization: {stats['server_utilization']:.2%}").grid(row=8, column=0, columnspan=2, sticky=tk.W)
-
-    def stop_simulation(self):
-        if self.animation:
-            self.animation.event_source.stop()
-
-def main():
-    root = tk.Tk()
-    app = QueueSimulationGUI(root)
-    root.mainloop()
+    # The Tk front end lives in queue_gui.py so importing this module never loads a GUI toolkit
+    from queue_gui import main as gui_main
+    gui_main()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(headless="--headless" in sys.argv)
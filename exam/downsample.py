@@ -0,0 +1,27 @@
+import numpy as np
+
+
+def minmax_downsample(x, y, num_bins):
+    """
+    Reduce a series sorted by x to at most four points per bin of equal width in x.
+
+    Each bin keeps its first value, minimum, maximum and last value, so spikes
+    and steps survive when the bins are the pixel columns of the plot. The
+    output size depends on num_bins only, which bounds the drawing cost
+    however many events the series holds. Series already that small are
+    returned unchanged.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) <= 4 * num_bins:
+        return x, y
+
+    edges = np.linspace(x[0], x[-1], num_bins + 1)
+    starts = np.unique(np.searchsorted(x, edges[:-1], side='left'))  # Empty bins collapse
+    ends = np.append(starts[1:], len(x)) - 1
+    lows = np.minimum.reduceat(y, starts)
+    highs = np.maximum.reduceat(y, starts)
+
+    out_x = np.column_stack((x[starts], x[starts], x[ends], x[ends])).ravel()
+    out_y = np.column_stack((y[starts], lows, highs, y[ends])).ravel()
+    return out_x, out_y
@@ -0,0 +1,162 @@
+import os
+import sys
+import time
+from collections import deque
+from functools import partial
+from tabulate import tabulate
+from event_kernel import ARRIVAL, DEPARTURE, EventScheduler, SteppableModel
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "random numbers"))
+from variates import LCGStream, VariateGenerator
+
+
+class GGcQueue(SteppableModel):
+    """
+    G/G/c queue on the event kernel: one FIFO line in front of c identical servers.
+
+    inter_arrival and service are zero-argument callables returning the next
+    time, so any distribution can be plugged in. Idle servers are kept on a
+    stack, so an arrival or departure costs O(1) whatever the number of
+    servers; the time-weighted queue length and busy-server count are
+    accumulated as the clock moves, not from stored histories. The callables
+    must be picklable (functions or functools.partial, not lambdas) for
+    snapshot() to work.
+    """
+
+    def __init__(self, num_servers, inter_arrival, service, max_customers):
+        self.num_servers = num_servers
+        self.inter_arrival = inter_arrival
+        self.service = service
+        self.max_customers = max_customers
+        self.scheduler = EventScheduler()
+        self.started = False
+        self.free_servers = list(range(num_servers - 1, -1, -1))
+        self.waiting = deque()
+        self.last_event_time = 0.0
+        self.queue_area = 0.0
+        self.busy_area = 0.0
+        self.total_delay = 0.0
+        self.customers_started = 0
+        self.total_customers_served = 0
+
+    def _advance(self):
+        now = self.scheduler.now
+        elapsed = now - self.last_event_time
+        self.queue_area += len(self.waiting) * elapsed
+        self.busy_area += (self.num_servers - len(self.free_servers)) * elapsed
+        self.last_event_time = now
+
+    def _start_service(self, server, arrival_time):
+        now = self.scheduler.now
+        service_time = self.service()
+        self.total_delay += now - arrival_time
+        self.customers_started += 1
+        self.scheduler.schedule(service_time, DEPARTURE, server)
+
+    def _arrival(self, _):
+        self._advance()
+        if self.free_servers:
+            self._start_service(self.free_servers.pop(), self.scheduler.now)
+        else:
+            self.waiting.append(self.scheduler.now)
+        self.scheduler.schedule(self.inter_arrival(), ARRIVAL)
+
+    def _departure(self, server):
+        self._advance()
+        self.total_customers_served += 1
+        if self.waiting:
+            self._start_service(server, self.waiting.popleft())
+        else:
+            self.free_servers.append(server)
+        if self.total_customers_served >= self.max_customers:
+            self.scheduler.stop()
+
+    @property
+    def finished(self):
+        return self.total_customers_served >= self.max_customers
+
+    def _handlers(self):
+        return [self._arrival, self._departure]
+
+    def _schedule_first_events(self):
+        self.scheduler.schedule(self.inter_arrival(), ARRIVAL)
+
+    def run_simulation(self, cancel=None):
+        self.run(cancel)
+        return self.calculate_statistics()
+
+    def calculate_statistics(self):
+        # The areas stop at the last event; after run_until() the clock can be later, so close the gap
+        # here without touching the accumulators, which keeps a resumed run identical to an uninterrupted one
+        end_time = self.scheduler.now
+        elapsed = end_time - self.last_event_time
+        queue_area = self.queue_area + len(self.waiting) * elapsed
+        busy_area = self.busy_area + (self.num_servers - len(self.free_servers)) * elapsed
+        return {
+            'avg_delay': self.total_delay / self.customers_started,
+            'avg_queue_length': queue_area / end_time,
+            'server_utilization': busy_area / (self.num_servers * end_time),
+            'simulation_time': end_time
+        }
+
+
+class MMcQueue(GGcQueue):
+    """M/M/c queue: exponential inter-arrival and service times from the in-house LCG."""
+
+    def __init__(self, mean_inter_arrival_time, mean_service_time, num_servers, max_customers, seed=None):
+        variates = VariateGenerator(LCGStream(seed).uniforms)
+        super().__init__(num_servers,
+                         partial(variates.next_exponential, mean_inter_arrival_time),
+                         partial(variates.next_exponential, mean_service_time),
+                         max_customers)
+        self.mean_inter_arrival_time = mean_inter_arrival_time
+        self.mean_service_time = mean_service_time
+
+
+def erlang_c(mean_inter_arrival_time, mean_service_time, num_servers):
+    """
+    Steady-state M/M/c delay, queue length and utilization from the Erlang C formula.
+
+    The Erlang B recursion B(k) = a B(k-1) / (k + a B(k-1)) avoids the
+    factorials, so hundreds of servers are fine.
+    """
+    offered_load = mean_service_time / mean_inter_arrival_time
+    rho = offered_load / num_servers
+    if rho >= 1:
+        raise ValueError("Queue is unstable: utilization must be below 1")
+    blocking = 1.0
+    for k in range(1, num_servers + 1):
+        blocking = offered_load * blocking / (k + offered_load * blocking)
+    wait_probability = blocking / (1 - rho * (1 - blocking))
+    avg_queue_length = wait_probability * rho / (1 - rho)
+    return {
+        'avg_delay': avg_queue_length * mean_inter_arrival_time,
+        'avg_queue_length': avg_queue_length,
+        'server_utilization': rho
+    }
+
+
+def main():
+    num_customers = 200_000
+    utilization = 0.9
+    rows = []
+    for num_servers in (1, 10, 100, 500):
+        mean_service_time = 1.0
+        mean_inter_arrival_time = mean_service_time / (utilization * num_servers)
+        queue = MMcQueue(mean_inter_arrival_time, mean_service_time, num_servers, num_customers, seed=1)
+        start = time.perf_counter()
+        stats = queue.run_simulation()
+        elapsed = time.perf_counter() - start
+        exact = erlang_c(mean_inter_arrival_time, mean_service_time, num_servers)
+        rows.append([num_servers, f"{stats['avg_delay']:.4f}", f"{exact['avg_delay']:.4f}",
+                     f"{stats['avg_queue_length']:.3f}", f"{exact['avg_queue_length']:.3f}",
+                     f"{stats['server_utilization']:.4f}", f"{queue.scheduler.events_processed / elapsed:,.0f}"])
+
+    headers = ["Servers", "Avg Delay", "Erlang C Delay", "Avg in Queue", "Erlang C in Queue", "Utilization",
+               "Events/s"]
+    print(f"M/M/c at utilization {utilization}, {num_customers} customers\n")
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from tabulate import tabulate
+from downsample import minmax_downsample
+
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".mov", ".avi", ".webm")
+
+
+class PursuitScene:
+    """
+    Entities of CircularChessSimulation over recorded frames.
+
+    `frames` is a (num_frames, n, 2) array or the path of a .npy file, which
+    each worker memory-maps instead of receiving a copy; `order` picks and
+    orders its rows (the slot order of a ring buffer).
+    """
+
+    def __init__(self, frames, order=None, steps=None, title="Circular Chess Simulation"):
+        self.frames = frames
+        self.order = order
+        self.steps = steps
+        self.title = title
+        self._data = None
+
+    @classmethod
+    def from_store(cls, store, title="Circular Chess Simulation"):
+        """Scene over a trajectory_store.TrajectoryStore, by file name if it is memory-mapped."""
+        order = store.slots()
+        steps = store.step_numbers[order]
+        if isinstance(store.frames, np.memmap):
+            store.flush()
+            return cls(store.frames.filename, order, steps, title)
+        return cls(np.asarray(store.frames[order]), None, steps, title)
+
+    def _frames(self):
+        if self._data is None:
+            data = np.load(self.frames, mmap_mode="r") if isinstance(self.frames, str) else self.frames
+            self._data = data if self.order is None else _Reordered(data, self.order)
+        return self._data
+
+    def __len__(self):
+        return len(self.order) if self.order is not None else len(self._frames())
+
+    def setup(self, fig):
+        import matplotlib.patches as patches
+
+        ax = fig.add_subplot(111)
+        ax.set_xlim(-1.2, 1.2)
+        ax.set_ylim(-1.2, 1.2)
+        ax.set_aspect('equal')
+        ax.grid(True)
+        ax.add_patch(patches.Circle((0, 0), 1, fill=False, linestyle='--', color='gray'))
+        ax.set_title(self.title)
+        self.scatter = ax.scatter([], [], c='blue', s=100)
+        self.label = ax.text(0.02, 0.97, "", transform=ax.transAxes, va='top')
+        self.artists = [self.scatter, self.label]
+
+    def draw(self, index):
+        self.scatter.set_offsets(self._frames()[index])
+        step = self.steps[index] if self.steps is not None else index
+        self.label.set_text(f"Step {step}")
+
+
+class _Reordered:
+    def __init__(self, data, order):
+        self.data = data
+        self.order = order
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, i):
+        return self.data[self.order[i]]
+
+
+class RandomWalkScene:
+    """Random-walk path growing frame by frame, decimated to about two points per horizontal pixel."""
+
+    def __init__(self, x_path, y_path, num_frames=None):
+        self.x_path = np.asarray(x_path)
+        self.y_path = np.asarray(y_path)
+        self.num_frames = num_frames or len(self.x_path)
+
+    def __len__(self):
+        return self.num_frames
+
+    def setup(self, fig):
+        ax = fig.add_subplot(111)
+        ax.set_xlabel("X Position")
+        ax.set_ylabel("Y Position")
+        ax.set_title(f"Random Walk - {len(self.x_path) - 1} steps")
+        ax.axhline(y=0, color='black', linewidth=1)
+        ax.axvline(x=0, color='black', linewidth=1)
+        ax.grid()
+        margin = 1 + 0.05 * max(np.ptp(self.x_path), np.ptp(self.y_path))
+        ax.set_xlim(self.x_path.min() - margin, self.x_path.max() + margin)
+        ax.set_ylim(self.y_path.min() - margin, self.y_path.max() + margin)
+        self.path_line, = ax.plot([], [], linestyle='-', linewidth=1, label="Random Walk Path")
+        start = ax.scatter([0], [0], color='green', s=100, label="Start (0,0)", zorder=3)
+        self.head, = ax.plot([], [], 'o', color='red', markersize=10, label="Current Position")
+        self.step_text = ax.text(0.02, 0.97, "", transform=ax.transAxes, va='top')
+        legend = ax.legend(loc='lower right')
+        # The start marker and legend sit above the path, so they are redrawn over it in zorder
+        self.artists = [self.path_line, self.head, start, self.step_text, legend]
+        self.max_points = 2 * int(fig.get_figwidth() * fig.dpi)
+
+    def draw(self, index):
+        step = (len(self.x_path) - 1) * index // max(self.num_frames - 1, 1)
+        x, y = self.x_path[:step + 1], self.y_path[:step + 1]
+        if len(x) > self.max_points:
+            stride = -(-len(x) // self.max_points)
+            x = np.append(x[::stride], x[-1])
+            y = np.append(y[::stride], y[-1])
+        self.path_line.set_data(x, y)
+        self.head.set_data([x[-1]], [y[-1]])
+        self.step_text.set_text(f"Step {step}/{len(self.x_path) - 1} ({x[-1]},{y[-1]})")
+
+
+class QueueScene:
+    """Queue length and server status of an M/M/1 run up to a clock that advances frame by frame."""
+
+    def __init__(self, times, queue_lengths, server_status, num_frames=300):
+        self.times = np.asarray(times)
+        self.queue_lengths = np.asarray(queue_lengths)
+        self.server_status = np.asarray(server_status)
+        self.num_frames = num_frames
+
+    @classmethod
+    def from_queue(cls, simulation, num_frames=300):
+        """Scene over the histories of a traced answer9.MM1Queue."""
+        return cls(simulation.time_history.values, simulation.queue_history.values,
+                   simulation.server_status_history.values, num_frames)
+
+    def __len__(self):
+        return self.num_frames
+
+    def setup(self, fig):
+        self.queue_ax = fig.add_subplot(211)
+        self.queue_ax.set_title("Queue Length Over Time")
+        self.queue_ax.set_xlabel("Time")
+        self.queue_ax.set_ylabel("Queue Length")
+        self.server_ax = fig.add_subplot(212)
+        self.server_ax.set_title("Server Status Over Time")
+        self.server_ax.set_xlabel("Time")
+        self.server_ax.set_ylabel("Server Status (0=Idle, 1=Busy)")
+        self.queue_line, = self.queue_ax.plot([], [], drawstyle='steps-post')
+        self.server_line, = self.server_ax.plot([], [], drawstyle='steps-post')
+
+        # Fixed axes for the whole run, so frames do not jump
+        for ax in (self.queue_ax, self.server_ax):
+            ax.set_xlim(self.times[0], self.times[-1])
+        self.queue_ax.set_ylim(0, max(self.queue_lengths.max(), 1) * 1.05)
+        self.server_ax.set_ylim(-0.05, 1.05)
+        fig.tight_layout()
+        self.artists = [self.queue_line, self.server_line]
+        self.pixel_width = int(fig.get_figwidth() * fig.dpi)
+
+    def draw(self, index):
+        clock = self.times[0] + (self.times[-1] - self.times[0]) * index / max(self.num_frames - 1, 1)
+        end = max(np.searchsorted(self.times, clock, side='right'), 1)
+        times = self.times[:end]
+        self.queue_line.set_data(*minmax_downsample(times, self.queue_lengths[:end], self.pixel_width))
+        self.server_line.set_data(*minmax_downsample(times, self.server_status[:end], self.pixel_width))
+
+
+def frame_schedule(num_frames, duration, fps):
+    """Source frames shown in a video of `duration` seconds at `fps`, evenly spaced over the run."""
+    count = min(num_frames, max(1, int(round(duration * fps))))
+    return np.unique(np.linspace(0, num_frames - 1, count).round().astype(int))
+
+
+def _render_range(scene, frame_indices, first_output, size, dpi, target):
+    # Worker: one Agg figure; the static parts are drawn once and each frame blits the scene's artists over them
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib.image import imsave
+
+    width, height = size
+    fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    scene.setup(fig)
+    for artist in scene.artists:
+        artist.set_animated(True)
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+
+    encoder = None
+    written = len(frame_indices)
+    if target[0] == "video":
+        _, segment, fps = target
+        # stderr goes to a file rather than a pipe, so a chatty ffmpeg can never block on it
+        encoder_log = tempfile.TemporaryFile()
+        encoder = subprocess.Popen(
+            ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}",
+             "-r", str(fps), "-i", "-", "-c:v", "libx264", "-pix_fmt", "yuv420p", segment],
+            stdin=subprocess.PIPE, stderr=encoder_log)
+
+    try:
+        for k, index in enumerate(frame_indices):
+            canvas.restore_region(background)
+            scene.draw(int(index))
+            for artist in scene.artists:
+                fig.draw_artist(artist)
+            if encoder is not None:
+                try:
+                    encoder.stdin.write(canvas.buffer_rgba())
+                except BrokenPipeError:
+                    written = k  # ffmpeg has exited; its status and messages are reported below
+                    break
+            else:
+                imsave(os.path.join(target[1], f"frame_{first_output + k:06d}.png"), np.asarray(canvas.buffer_rgba()),
+                       pil_kwargs={"compress_level": 1})
+    finally:
+        if encoder is not None:
+            with contextlib.suppress(BrokenPipeError):
+                encoder.stdin.close()
+            status = encoder.wait()
+            encoder_log.seek(0)
+            errors = encoder_log.read().decode(errors="replace").strip()
+            encoder_log.close()
+            if status != 0 or written < len(frame_indices):
+                raise RuntimeError(f"ffmpeg exited with status {status} after {written} of {len(frame_indices)} "
+                                   f"frames on {target[1]}: {errors or '(no output)'}")
+    return len(frame_indices)
+
+
+def render(scene, output, duration=10.0, fps=30, size=(800, 600), dpi=100, workers=None):
+    """
+    Render a scene offline with the Agg backend, without a display.
+
+    A scene has a length in source frames, builds its figure in setup(fig),
+    lists the artists that change between frames in `artists` and updates
+    them in draw(index); see PursuitScene, RandomWalkScene and QueueScene.
+    Only the frames that fit `duration` seconds at `fps` are drawn (see
+    frame_schedule). They are split into contiguous ranges, one per worker
+    process, and each worker reuses one figure for its range, redrawing
+    only the scene's moving artists over a cached background. An output
+    ending in a video extension is encoded by piping raw RGBA buffers to
+    ffmpeg, one segment per worker, then joined without re-encoding; any
+    other output is a directory that receives a PNG sequence.
+
+    Returns:
+        Number of frames rendered
+    """
+    frames = frame_schedule(len(scene), duration, fps)
+    workers = min(workers or os.cpu_count() or 1, len(frames))
+    ranges = [r for r in np.array_split(frames, workers) if len(r)]
+    firsts = np.cumsum([0] + [len(r) for r in ranges[:-1]])
+
+    video = output.lower().endswith(VIDEO_EXTENSIONS)
+    if video and shutil.which("ffmpeg") is None:
+        raise RuntimeError("ffmpeg not found; render to a directory to get a PNG sequence")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if video:
+            targets = [("video", os.path.join(scratch, f"segment_{i:03d}.mp4"), fps) for i in range(len(ranges))]
+        else:
+            os.makedirs(output, exist_ok=True)
+            targets = [("png", output)] * len(ranges)
+
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            rendered = sum(pool.map(_render_range, [scene] * len(ranges), ranges, firsts,
+                                    [size] * len(ranges), [dpi] * len(ranges), targets))
+
+        if video:
+            listing = os.path.join(scratch, "segments.txt")
+            with open(listing, "w") as f:
+                f.writelines(f"file '{target[1]}'\n" for target in targets)
+            joined = subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", listing,
+                                     "-c", "copy", output], stderr=subprocess.PIPE)
+            if joined.returncode != 0:
+                raise RuntimeError(f"ffmpeg exited with status {joined.returncode} joining {output}: "
+                                   f"{joined.stderr.decode(errors='replace').strip() or '(no output)'}")
+    return rendered
+
+
+def main():
+    from answer7 import CircularChessSimulation
+    from answer9 import MM1Queue
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Monte Carlo"))
+    from random_walk import random_walk
+
+    out_dir = sys.argv[1] if len(sys.argv) > 1 else "renders"
+    extension = ".mp4" if shutil.which("ffmpeg") else ""
+    duration, fps = 4.0, 25
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        pursuit = CircularChessSimulation(8, 20_000, 0.0005)
+        pursuit.run_simulation()
+        x_path, y_path = random_walk(1_000_000, seed=1)
+    queue = MM1Queue(1.0, 0.9, 200_000, seed=1)
+    queue.run_simulation()
+
+    scenes = {
+        "pursuit": PursuitScene.from_store(pursuit.history),
+        "random_walk": RandomWalkScene(x_path, y_path, num_frames=1000),
+        "queue": QueueScene.from_queue(queue, num_frames=1000),
+    }
+    rows = []
+    for name, scene in scenes.items():
+        output = os.path.join(out_dir, name + extension)
+        start = time.perf_counter()
+        frames = render(scene, output, duration, fps)
+        elapsed = time.perf_counter() - start
+        rows.append([name, len(scene), frames, f"{elapsed:.2f}", f"{frames / elapsed:.1f}", output])
+
+    print(f"{duration:g} s at {fps} fps, {os.cpu_count()} worker processes\n")
+    print(tabulate(rows, headers=["Scene", "Source Frames", "Rendered", "Time (s)", "Frames/s", "Output"],
+                   tablefmt="grid"))
+
+
+if __name__ == "__main__":
+    main()
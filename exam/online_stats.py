@@ -0,0 +1,122 @@
+import math
+from bisect import bisect_right, insort
+
+
+class TimeWeightedAverage:
+    """
+    Running integral of a piecewise-constant quantity such as queue length or server status.
+
+    update(now, value) closes the interval since the last update with the old
+    value and switches to the new one, so each event costs O(1) and nothing
+    is stored.
+    """
+
+    def __init__(self, value=0.0, start_time=0.0):
+        self.value = value
+        self.start_time = start_time
+        self.last_time = start_time
+        self.area = 0.0
+        self.maximum = value
+
+    def update(self, now, value):
+        self.area += self.value * (now - self.last_time)
+        self.last_time = now
+        self.value = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def mean(self, now=None):
+        """Time average up to `now` (default: the last update)."""
+        now = self.last_time if now is None else now
+        elapsed = now - self.start_time
+        area = self.area + self.value * (now - self.last_time)
+        return area / elapsed if elapsed > 0 else 0.0
+
+
+class RunningMoments:
+    """Count, mean, variance, minimum and maximum in one pass with Welford's update."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if x < self.minimum:
+            self.minimum = x
+        if x > self.maximum:
+            self.maximum = x
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+
+class P2Quantile:
+    """
+    Streaming estimate of the p-quantile with the P² algorithm (Jain & Chlamtac, 1985).
+
+    Five markers track the minimum, the p/2, p and (1+p)/2 quantiles and the
+    maximum; after each observation the middle markers move towards their
+    desired positions along a piecewise-parabolic fit. Memory is constant.
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        # Desired positions of the middle markers are 1 + 2p, 1 + 4p, 3 + 2p plus these per-observation increments
+        self.start = (0.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p)
+        self.increments = (0.0, p / 2, p, (1 + p) / 2)
+
+    def add(self, x):
+        self.count += 1
+        q = self.heights
+        if self.count <= 5:
+            insort(q, x)
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 1
+        elif x >= q[4]:
+            q[4] = x
+            k = 4
+        else:
+            k = bisect_right(q, x)
+
+        n = self.positions
+        for i in range(k, 5):
+            n[i] += 1
+
+        extra = self.count - 5
+        for i in (1, 2, 3):
+            d = self.start[i] + extra * self.increments[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < height < q[i + 1]:
+                    # Parabolic step would break the ordering; fall back to linear interpolation
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def value(self):
+        if not self.heights:
+            return math.nan
+        if self.count <= 5:
+            return self.heights[round(self.p * (len(self.heights) - 1))]
+        return self.heights[2]
@@ -0,0 +1,194 @@
+import time
+import numpy as np
+from tabulate import tabulate
+from pursuit_batch import PursuitBatch
+
+# Dormand-Prince 5(4) tableau; the last stage is the derivative at the new point (first same as last)
+DP_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+DP_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])
+DP_ERROR = DP_B - np.array([5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+
+
+def pursuit_velocity(positions, softening):
+    """
+    Unit-speed pursuit of the next entity, (x_{i+1} - x_i) / sqrt(|x_{i+1} - x_i|^2 + softening^2).
+
+    The softening keeps the field smooth where pursuer and target meet,
+    where the plain normalization divides by zero; for distances well above
+    it the speed is 1 to within (softening / distance)^2 / 2.
+    """
+    directions = np.roll(positions, -1, axis=0) - positions
+    distances = np.sqrt(np.einsum('ij,ij->i', directions, directions) + softening ** 2)
+    return directions / distances[:, None]
+
+
+def max_spread(positions):
+    """Largest distance to entity 0, the quantity CircularChessSimulation.check_convergence tests."""
+    return np.sqrt(np.einsum('ij,ij->i', positions - positions[0], positions - positions[0]).max())
+
+
+def hermite(y0, f0, y1, f1, h, theta):
+    """Cubic Hermite interpolant of a step at fraction theta, from its end values and derivatives."""
+    return ((1 - theta) * y0 + theta * y1
+            + theta * (theta - 1) * ((1 - 2 * theta) * (y1 - y0) + (theta - 1) * h * f0 + theta * h * f1))
+
+
+def locate_event(g, low, high, g_low, g_high, tolerance=1e-12, max_iterations=100):
+    """Root of g in [low, high], where g changes sign, by the Illinois variant of regula falsi."""
+    side = 0
+    for _ in range(max_iterations):
+        mid = (low * g_high - high * g_low) / (g_high - g_low)
+        g_mid = g(mid)
+        if g_mid * g_high > 0:
+            high, g_high = mid, g_mid
+            if side == -1:
+                g_low /= 2
+            side = -1
+        else:
+            low, g_low = mid, g_mid
+            if side == 1:
+                g_high /= 2
+            side = 1
+        if high - low < tolerance or g_mid == 0:
+            break
+    return mid
+
+
+def integrate_adaptive(positions, convergence_threshold=1e-3, rtol=1e-6, atol=1e-9, softening=None,
+                       max_steps=100_000, on_step=None):
+    """
+    Integrate the pursuit model with Dormand-Prince 5(4) steps until the entities converge.
+
+    The step size follows the embedded error estimate, so the entities take
+    long steps while they are far apart. Convergence, max_spread falling to
+    convergence_threshold, is an event: when a step crosses it, the crossing
+    time is found by root-finding on the step's Hermite interpolant and the
+    state is interpolated there. A start that has already converged returns
+    time 0 without a step. on_step(t, positions) is called after every
+    accepted step.
+
+    Returns:
+        Dictionary with the event time, positions, accepted and rejected
+        steps and derivative evaluations
+    """
+    softening = convergence_threshold * 1e-3 if softening is None else softening
+    y = np.array(positions, dtype=float)
+    if max_spread(y) < convergence_threshold:
+        # Converged at the start (a single entity always is): no step, and no step size to derive from f
+        return {"time": 0.0, "positions": y, "converged": True, "steps": 0, "rejected": 0, "evaluations": 0}
+    f = pursuit_velocity(y, softening)
+    t = 0.0
+    h = 0.01 * np.abs(y).max() / max(np.abs(f).max(), 1e-300)
+    stages = np.empty((7,) + y.shape)
+    accepted = rejected = 0
+    evaluations = 1
+    previous_error = 1e-4
+
+    while accepted < max_steps:
+        stages[0] = f
+        for i in range(1, 7):
+            stages[i] = pursuit_velocity(y + h * np.tensordot(DP_A[i], stages[:i], axes=1), softening)
+        evaluations += 6
+        y_new = y + h * np.tensordot(DP_B, stages, axes=1)
+        error = h * np.tensordot(DP_ERROR, stages, axes=1)
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        error_norm = np.sqrt(np.mean((error / scale) ** 2))
+
+        if error_norm > 1:
+            rejected += 1
+            h *= max(0.2, 0.9 * error_norm ** -0.2)
+            continue
+
+        f_new = stages[6]
+        if max_spread(y_new) < convergence_threshold:
+            def g(theta):
+                return max_spread(hermite(y, f, y_new, f_new, h, theta)) - convergence_threshold
+            # g(1) < 0 by the test above and g(0) >= 0 because y did not converge; bracket only a real sign change
+            g_start, g_end = g(0.0), g(1.0)
+            theta = locate_event(g, 0.0, 1.0, g_start, g_end) if g_start > 0 > g_end else 0.0
+            y = hermite(y, f, y_new, f_new, h, theta)
+            t += theta * h
+            accepted += 1
+            if on_step is not None:
+                on_step(t, y)
+            return {"time": t, "positions": y, "converged": True, "steps": accepted, "rejected": rejected,
+                    "evaluations": evaluations}
+
+        t += h
+        y, f = y_new, f_new.copy()
+        accepted += 1
+        if on_step is not None:
+            on_step(t, y)
+        # PI step control: the previous error term damps growth while the polygon keeps shrinking
+        error_norm = max(error_norm, 1e-10)
+        h *= min(5.0, max(0.2, 0.9 * error_norm ** -0.14 * previous_error ** 0.08))
+        previous_error = error_norm
+
+    return {"time": t, "positions": y, "converged": False, "steps": accepted, "rejected": rejected,
+            "evaluations": evaluations}
+
+
+def polygon_convergence_time(n_entities, convergence_threshold=1e-3):
+    """
+    Exact convergence time of n entities starting on the unit circle as a regular polygon.
+
+    The polygon stays regular and its side s shrinks at the constant rate
+    1 - cos(2 pi / n); the largest distance to entity 0 is a fixed multiple
+    of s, so the threshold is crossed at a known fraction of the collapse time.
+    """
+    k = np.arange(n_entities)
+    side = 2 * np.sin(np.pi / n_entities)
+    spread_per_side = np.abs(2 * np.sin(np.pi * k / n_entities)).max() / side
+    threshold_side = convergence_threshold / spread_per_side
+    return (side - threshold_side) / (1 - np.cos(2 * np.pi / n_entities))
+
+
+def fixed_step_run(n_entities, dt, max_steps, convergence_threshold=1e-3):
+    """Convergence time of the fixed-step model (same arithmetic as CircularChessSimulation), or nan."""
+    batch = PursuitBatch(n_entities, [dt], convergence_threshold)
+    step = int(batch.run(max_steps)[0])
+    return (step + 1) * dt if step < max_steps else np.nan, batch.updates
+
+
+def main():
+    tolerance = 1e-3  # Target accuracy of the convergence time
+    rows = []
+    for n in (3, 4, 6, 8, 12):
+        angles = np.linspace(0, 2*np.pi, n, endpoint=False)
+        start_positions = np.column_stack((np.cos(angles), np.sin(angles)))
+        exact = polygon_convergence_time(n)
+
+        start = time.perf_counter()
+        adaptive = integrate_adaptive(start_positions, rtol=1e-6)
+        adaptive_time = time.perf_counter() - start
+
+        # Halve dt until the fixed-step convergence time is within the tolerance
+        dt = 1e-3
+        while True:
+            start = time.perf_counter()
+            fixed, steps = fixed_step_run(n, dt, int(2 * exact / dt) + 10)
+            fixed_time = time.perf_counter() - start
+            if abs(fixed - exact) <= tolerance or dt < 1e-6:
+                break
+            dt /= 2
+
+        rows.append([n, f"{exact:.6f}",
+                     adaptive["steps"], adaptive["rejected"], f"{abs(adaptive['time'] - exact):.1e}",
+                     f"{adaptive_time * 1e3:.1f}",
+                     f"{dt:.2e}", steps, f"{abs(fixed - exact):.1e}", f"{fixed_time * 1e3:.1f}"])
+
+    print(f"Time to converge to within 1e-3, target accuracy {tolerance:g}\n")
+    print(tabulate(rows, headers=["n", "Exact", "DP45 Steps", "Rejected", "DP45 Error", "DP45 (ms)",
+                                  "Euler dt", "Euler Steps", "Euler Error", "Euler (ms)"], tablefmt="grid"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import time
+import numpy as np
+from tabulate import tabulate
+from answer7 import CircularChessSimulation
+
+
+class PursuitBatch:
+    """
+    Many CircularChessSimulation runs with the same number of entities, stepped together.
+
+    The state is one (batch, n, 2) array; member b moves with its own time
+    step dts[b]. Every step works in preallocated buffers through out=
+    arguments, so no arrays are allocated per step (NumPy's iterator only
+    uses its own fixed-size scratch buffers), and it performs the same
+    floating-point operations as CircularChessSimulation.update_positions,
+    so each member reproduces the single run exactly. Members that converge
+    are dropped from the active set, which is compacted to the front of the
+    buffers together with their time steps, so finished members cost no
+    further work.
+    """
+
+    def __init__(self, n_entities, dts, convergence_threshold=1e-3):
+        self.n_entities = n_entities
+        self.dts = np.asarray(dts, dtype=float)
+        self.convergence_threshold = convergence_threshold
+        batch = len(self.dts)
+
+        angles = np.linspace(0, 2*np.pi, n_entities, endpoint=False)
+        self.positions = np.empty((batch, n_entities, 2))
+        self.positions[:] = np.column_stack((np.cos(angles), np.sin(angles)))
+        self._directions = np.empty_like(self.positions)
+        self._squares = np.empty_like(self.positions)
+        self._distances = np.empty((batch, n_entities))
+        self._dts = self.dts.copy()  # Time steps of the active rows, compacted with them
+        self._max_distance = np.empty(batch)
+        self._converged = np.empty(batch, dtype=bool)
+
+        self.active = np.arange(batch)  # Original index of each active row
+        self.steps = np.full(batch, -1)  # Convergence step, -1 while running
+        self.max_distance = np.full(batch, np.inf)
+        self.final_positions = np.empty_like(self.positions)
+        self.updates = 0
+
+    def update_positions(self):
+        k = len(self.active)
+        positions = self.positions[:k]
+        directions = self._directions[:k]
+        distances = self._distances[:k]
+        squares = self._squares[:k]
+
+        # directions = roll(positions, -1) - positions, without the rolled copy
+        np.subtract(positions[:, 1:], positions[:, :-1], out=directions[:, :-1])
+        np.subtract(positions[:, 0], positions[:, -1], out=directions[:, -1])
+        np.multiply(directions, directions, out=squares)
+        np.add.reduce(squares, axis=-1, out=distances)
+        np.sqrt(distances, out=distances)
+        np.divide(directions, distances[..., None], out=directions)
+        np.multiply(directions, self._dts[:k, None, None], out=directions)
+        positions += directions
+        self.updates += 1
+
+    def check_convergence(self):
+        """Largest distance to entity 0 for every active member."""
+        k = len(self.active)
+        positions = self.positions[:k]
+        offsets = self._directions[:k]
+        distances = self._distances[:k]
+        np.subtract(positions, positions[:, :1], out=offsets)
+        np.multiply(offsets, offsets, out=self._squares[:k])
+        np.add.reduce(self._squares[:k], axis=-1, out=distances)
+        np.sqrt(distances, out=distances)
+        return np.max(distances, axis=1, out=self._max_distance[:k])
+
+    def _retire(self, done, max_distance):
+        rows = self.active[done]
+        self.final_positions[rows] = self.positions[:len(self.active)][done]
+        self.max_distance[rows] = max_distance[done]
+        keep = ~done
+        k = len(self.active)
+        remaining = int(keep.sum())
+        self.positions[:remaining] = self.positions[:k][keep]
+        self._dts[:remaining] = self._dts[:k][keep]
+        self.active = self.active[keep]
+        return rows
+
+    def run(self, max_steps=1000):
+        """
+        Step until every member converges or max_steps updates have been made.
+
+        steps[b] follows CircularChessSimulation.run_simulation: the step
+        counter when convergence is detected, or max_steps without convergence.
+        """
+        while len(self.active) and self.updates < max_steps:
+            self.update_positions()
+            max_distance = self.check_convergence()
+            converged = np.less(max_distance, self.convergence_threshold, out=self._converged[:len(self.active)])
+            if converged.any():
+                self.steps[self._retire(converged, max_distance)] = self.updates - 1
+
+        if len(self.active):
+            self.steps[self._retire(np.ones(len(self.active), dtype=bool), self.check_convergence())] = max_steps
+        return self.steps
+
+
+def sweep(n_values, dt_values, max_steps=1000, convergence_threshold=1e-3):
+    """Convergence step and final spread of every (n, dt) pair, one PursuitBatch per n."""
+    results = {}
+    for n in n_values:
+        batch = PursuitBatch(n, dt_values, convergence_threshold)
+        steps = batch.run(max_steps)
+        for dt, step, distance in zip(dt_values, steps, batch.max_distance):
+            results[n, dt] = (int(step), float(distance))
+    return results
+
+
+def single_run(n_entities, dt, max_steps=1000, convergence_threshold=1e-3):
+    """Convergence step of one CircularChessSimulation, stepped as run_simulation does but without its tables."""
+    sim = CircularChessSimulation(n_entities, max_steps, dt)
+    sim.convergence_threshold = convergence_threshold
+    step = 0
+    while step < max_steps:
+        sim.update_positions()
+        if sim.check_convergence()[0]:
+            break
+        step += 1
+    return step
+
+
+def main():
+    n_values = list(range(3, 13))
+    dt_values = np.round(np.geomspace(0.0005, 0.0025, 20), 6)
+    max_steps, convergence_threshold = 10_000, 1e-2
+
+    start = time.perf_counter()
+    results = sweep(n_values, dt_values, max_steps, convergence_threshold)
+    batch_time = time.perf_counter() - start
+
+    # Fixed steps of length dt end in a limit cycle of side about dt, so coarse steps may never reach the threshold
+    rows = [[n] + [step if step < max_steps else f"({distance:.2g})" for step, distance in
+                   (results[n, dt] for dt in dt_values[::2])] for n in n_values]
+    print(f"Convergence step to a spread of {convergence_threshold:g} for {len(n_values) * len(dt_values)} "
+          f"configurations, every other dt shown\n(in parentheses: spread after {max_steps} steps without "
+          f"convergence)\n")
+    print(tabulate(rows, headers=["n \\ dt"] + [f"{dt:g}" for dt in dt_values[::2]], tablefmt="grid"))
+
+    # Every fourth configuration one at a time, extrapolated per step to the whole sweep
+    updates = {key: min(step + 1, max_steps) for key, (step, _) in results.items()}
+    subset = list(results)[::4]
+    start = time.perf_counter()
+    matches = sum(single_run(n, dt, max_steps, convergence_threshold) == results[n, dt][0] for n, dt in subset)
+    single_time = (time.perf_counter() - start) * sum(updates.values()) / sum(updates[key] for key in subset)
+
+    print(f"\nBatched sweep {batch_time:.2f} s, one at a time about {single_time:.2f} s "
+          f"({single_time / batch_time:.1f}x; model steps only, extrapolated from {len(subset)} runs, "
+          f"{matches}/{len(subset)} identical step counts)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import queue
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from answer9 import MM1Queue
+from event_kernel import CancellationToken
+from downsample import minmax_downsample
+
+POLL_INTERVAL_MS = 50  # How often the Tk thread looks for new snapshots
+SNAPSHOT_INTERVAL = 0.25  # Minimum seconds between snapshots from the simulation thread
+
+class QueueSimulationGUI:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("M/M/1 Queue Simulation")
+        self.main_frame = ttk.Frame(root, padding="10")
+        self.main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.create_parameter_frame()
+        self.create_plots()
+        self.create_control_buttons()
+        self.simulation = None
+        self.cancel = None
+        # Snapshots travel from the simulation thread to the Tk thread; only the Tk thread touches widgets
+        self.snapshots = queue.Queue()
+        self.pixel_width = 800
+        self.last_snapshot_time = 0.0
+
+    def create_parameter_frame(self):
+        param_frame = ttk.LabelFrame(self.main_frame, text="Simulation Parameters", padding="5")
+        param_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        
+        self.mean_inter_arrival = tk.DoubleVar(value=2.0)
+        self.mean_service = tk.DoubleVar(value=1.5)
+        self.max_customers = tk.IntVar(value=1000)
+        
+        ttk.Label(param_frame, text="Mean Inter-arrival Time:").grid(row=0, column=0, sticky=tk.W)
+        ttk.Entry(param_frame, textvariable=self.mean_inter_arrival, width=10).grid(row=0, column=1, padx=5)
+        
+        ttk.Label(param_frame, text="Mean Service Time:").grid(row=1, column=0, sticky=tk.W)
+        ttk.Entry(param_frame, textvariable=self.mean_service, width=10).grid(row=1, column=1, padx=5)
+        
+        ttk.Label(param_frame, text="Max Customers:").grid(row=2, column=0, sticky=tk.W)
+        ttk.Entry(param_frame, textvariable=self.max_customers, width=10).grid(row=2, column=1, padx=5)
+
+    def create_plots(self):
+        self.fig = Figure(figsize=(10, 6))
+        
+        self.queue_ax = self.fig.add_subplot(211)
+        self.queue_ax.set_title("Queue Length Over Time")
+        self.queue_ax.set_xlabel("Time")
+        self.queue_ax.set_ylabel("Queue Length")
+        
+        self.server_ax = self.fig.add_subplot(212)
+        self.server_ax.set_title("Server Status Over Time")
+        self.server_ax.set_xlabel("Time")
+        self.server_ax.set_ylabel("Server Status (0=Idle, 1=Busy)")
+        
+        # The lines are created once and only get new data
+        self.queue_line, = self.queue_ax.plot([], [], drawstyle='steps-post')
+        self.server_line, = self.server_ax.plot([], [], drawstyle='steps-post')
+        
+        self.fig.tight_layout()
+        
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.main_frame)
+        self.canvas.get_tk_widget().grid(row=1, column=0, columnspan=2, pady=5)
+
+    def create_control_buttons(self):
+        button_frame = ttk.Frame(self.main_frame)
+        button_frame.grid(row=2, column=0, columnspan=2, pady=5)
+        
+        ttk.Button(button_frame, text="Run Simulation", command=self.run_simulation).grid(row=0, column=0, padx=5)
+        ttk.Button(button_frame, text="Stop", command=self.stop_simulation).grid(row=0, column=1, padx=5)
+
+    def run_simulation(self):
+        self.simulation = MM1Queue(
+            self.mean_inter_arrival.get(),
+            self.mean_service.get(),
+            self.max_customers.get()
+        )
+        self.cancel = CancellationToken()
+        
+        thread = threading.Thread(target=self.run_simulation_thread, daemon=True)
+        thread.start()
+        self.root.after(POLL_INTERVAL_MS, self.poll_snapshots)
+
+    def run_simulation_thread(self):
+        # Simulation thread: never touches Tk or matplotlib, only posts snapshots
+        stats = self.simulation.run_simulation(on_progress=self.post_snapshot, cancel=self.cancel)
+        self.snapshots.put((self.make_snapshot(self.simulation), stats))
+
+    def post_snapshot(self, event):
+        now = time.perf_counter()
+        if now - self.last_snapshot_time >= SNAPSHOT_INTERVAL:
+            self.last_snapshot_time = now
+            self.snapshots.put((self.make_snapshot(event["queue"]), None))
+
+    def make_snapshot(self, simulation):
+        # Downsampled to the canvas width, so drawing cost does not grow with the number of events
+        times = simulation.time_history.values
+        return (minmax_downsample(times, simulation.queue_history.values, self.pixel_width),
+                minmax_downsample(times, simulation.server_status_history.values, self.pixel_width))
+
+    def poll_snapshots(self):
+        latest = None
+        try:
+            while True:
+                latest = self.snapshots.get_nowait()
+        except queue.Empty:
+            pass
+        self.pixel_width = max(self.canvas.get_tk_widget().winfo_width(), 100)
+
+        if latest is not None:
+            snapshot, stats = latest
+            self.draw_snapshot(snapshot)
+            if stats is not None:
+                self.show_statistics(stats)
+                return
+        self.root.after(POLL_INTERVAL_MS, self.poll_snapshots)
+
+    def draw_snapshot(self, snapshot):
+        (queue_times, queue_lengths), (server_times, server_status) = snapshot
+        self.queue_line.set_data(queue_times, queue_lengths)
+        self.server_line.set_data(server_times, server_status)
+        for ax in (self.queue_ax, self.server_ax):
+            ax.relim()
+            ax.autoscale_view()
+        self.canvas.draw_idle()
+
+    def show_statistics(self, stats):
+        stats_window = tk.Toplevel(self.root)
+        stats_window.title("Simulation Results")
+        
+        ttk.Label(stats_window, text="M/M/1 Queue Simulation Results").grid(row=0, column=0, columnspan=2, pady=5)
+        ttk.Label(stats_window, text="-" * 40).grid(row=1, column=0, columnspan=2)
+        
+        ttk.Label(stats_window, text=f"Mean Inter-arrival Time: {self.mean_inter_arrival.get():.2f}").grid(row=2, column=0, columnspan=2, sticky=tk.W)
+        ttk.Label(stats_window, text=f"Mean Service Time: {self.mean_service.get():.2f}").grid(row=3, column=0, columnspan=2, sticky=tk.W)
+        ttk.Label(stats_window, text=f"Number of Customers: {self.simulation.total_customers_served}").grid(row=4, column=0, columnspan=2, sticky=tk.W)
+        ttk.Label(stats_window, text=f"Simulation Time: {stats['simulation_time']:.2f}").grid(row=5, column=0, columnspan=2, sticky=tk.W)
+        ttk.Label(stats_window, text=f"Average Delay in Queue: {stats['avg_delay']:.2f}").grid(row=6, column=0, columnspan=2, sticky=tk.W)
+        ttk.Label(stats_window, text=f"Average Number in Queue: {stats['avg_queue_length']:.2f}").grid(row=7, column=0, columnspan=2, sticky=tk.W)
+        ttk.Label(stats_window, text=f"Server Utilization: {stats['server_utilization']:.2%}").grid(row=8, column=0, columnspan=2, sticky=tk.W)
+
+    def stop_simulation(self):
+        # The engine checks the token between event batches and returns the statistics so far
+        if self.cancel is not None:
+            self.cancel.cancel()
+
+def main():
+    root = tk.Tk()
+    app = QueueSimulationGUI(root)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
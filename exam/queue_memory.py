@@ -0,0 +1,36 @@
+import sys
+import time
+import tracemalloc
+from tabulate import tabulate
+from answer9 import MM1Queue
+
+
+def measure_memory(num_customers, mean_inter_arrival_time=2.0, mean_service_time=1.5, seed=1, trace=True):
+    """Peak and retained heap bytes of one MM1Queue run, traced with tracemalloc."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    queue = MM1Queue(mean_inter_arrival_time, mean_service_time, num_customers, seed=seed, trace=trace)
+    queue.run_simulation()
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del queue
+    return retained, peak, elapsed
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    rows = []
+    for trace in (True, False):
+        for n in sizes:
+            retained, peak, elapsed = measure_memory(n, trace=trace)
+            rows.append(["traced" if trace else "online", n, f"{retained / 2**20:.1f}", f"{peak / 2**20:.1f}",
+                         f"{retained / n:.1f}", f"{peak / n:.1f}", f"{elapsed:.2f}"])
+
+    headers = ["Statistics", "Customers", "Retained (MiB)", "Peak (MiB)", "Retained Bytes/Customer",
+               "Peak Bytes/Customer", "Time (s)"]
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+
+
+if __name__ == "__main__":
+    main()
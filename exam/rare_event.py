@@ -0,0 +1,152 @@
+import os
+import sys
+import time
+import numpy as np
+from tabulate import tabulate
+from answer9 import MM1Queue
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "random numbers"))
+from variates import substream_seeds
+
+NEVER = 2**62  # max_customers for cycles that must only end at the overflow level or an empty system
+CLONE_BUFFER = 64  # Small variate buffers keep snapshots cheap to pickle
+
+
+def overflow_probability(mean_inter_arrival, mean_service_time, level):
+    """
+    Exact probability that a busy cycle of an M/M/1 queue builds a line of `level` waiting customers.
+
+    The number in system is a birth-death walk started at 1; reaching
+    level + 1 before 0 is the gambler's ruin probability with r = mu / lambda.
+    """
+    r = mean_inter_arrival / mean_service_time
+    if r == 1:
+        return 1 / (level + 1)
+    return (r - 1) / (r ** (level + 1) - 1)
+
+
+def start_cycle(mean_inter_arrival, mean_service_time, seed):
+    # Fresh queue advanced to the first arrival, which starts a busy cycle
+    queue = MM1Queue(mean_inter_arrival, mean_service_time, NEVER, trace=False, delay_quantiles=())
+    queue.reseed(seed, CLONE_BUFFER)
+    while not queue.server_busy:
+        queue.step(1)
+    return queue
+
+
+def run_to_level(queue, level):
+    """Advance until `level` customers are waiting (True) or the system empties (False)."""
+    while True:
+        queue.step(1)
+        if queue.queue_length >= level:
+            return True
+        if not queue.server_busy:
+            return False
+
+
+def crude_estimate(mean_inter_arrival, mean_service_time, level, num_cycles, seed=1):
+    start = time.process_time()
+    seeds = substream_seeds(seed, num_cycles).tolist()
+    hits = sum(run_to_level(start_cycle(mean_inter_arrival, mean_service_time, s), level) for s in seeds)
+    p = hits / num_cycles
+    return {
+        "estimate": p,
+        "relative_error": np.sqrt((1 - p) / (num_cycles * p)) if hits else np.inf,
+        "cpu_seconds": time.process_time() - start,
+        "samples": num_cycles
+    }
+
+
+def fixed_effort_splitting(mean_inter_arrival, mean_service_time, thresholds, effort, seeds):
+    """
+    One fixed-effort splitting estimate of reaching thresholds[-1] waiting customers in a busy cycle.
+
+    Stage k runs `effort` trajectories, each restored from one of the
+    snapshots that reached thresholds[k - 1] (taken in turn) and reseeded so
+    the clones diverge, until they reach thresholds[k] or the system empties.
+    The estimate is the product of the stage success fractions.
+    """
+    entrance = [start_cycle(mean_inter_arrival, mean_service_time, next(seeds)).snapshot() for _ in range(effort)]
+    queue = MM1Queue(mean_inter_arrival, mean_service_time, NEVER, trace=False, delay_quantiles=())
+    estimate = 1.0
+
+    for threshold in thresholds:
+        reached = []
+        for i in range(effort):
+            queue.restore(entrance[i % len(entrance)])
+            queue.reseed(next(seeds), CLONE_BUFFER)
+            if run_to_level(queue, threshold):
+                reached.append(queue.snapshot())
+        estimate *= len(reached) / effort
+        if not reached:
+            return 0.0
+        entrance = reached
+    return estimate
+
+
+def splitting_estimate(mean_inter_arrival, mean_service_time, level, thresholds=None, effort=200, repetitions=20,
+                       seed=1):
+    """Mean of independent fixed-effort splitting runs, with the relative error from their spread."""
+    start = time.process_time()
+    if thresholds is None:
+        thresholds = list(range(4, level, 4)) + [level]
+    seeds = iter(substream_seeds(seed, repetitions * effort * (len(thresholds) + 1)).tolist())
+    runs = np.array([fixed_effort_splitting(mean_inter_arrival, mean_service_time, thresholds, effort, seeds)
+                     for _ in range(repetitions)])
+    p = runs.mean()
+    return {
+        "estimate": p,
+        "relative_error": runs.std(ddof=1) / (p * np.sqrt(repetitions)) if p > 0 else np.inf,
+        "cpu_seconds": time.process_time() - start,
+        "samples": repetitions * effort * len(thresholds)
+    }
+
+
+def importance_sampling_estimate(mean_inter_arrival, mean_service_time, level, num_cycles, seed=1):
+    """
+    Importance sampling with the arrival and service rates swapped.
+
+    Under the swapped (unstable) queue overflow is likely. Each arrival then
+    has likelihood ratio lambda / mu against the original queue and each
+    departure mu / lambda, so a cycle carries (lambda / mu)^(arrivals -
+    departures), i.e. the ratio raised to the change in the number in system.
+    """
+    start = time.process_time()
+    ratio = mean_service_time / mean_inter_arrival  # lambda / mu
+    seeds = substream_seeds(seed, num_cycles).tolist()
+    weights = np.zeros(num_cycles)
+    for i, s in enumerate(seeds):
+        queue = start_cycle(mean_service_time, mean_inter_arrival, s)
+        if run_to_level(queue, level):
+            in_system = queue.queue_length + queue.server_busy
+            weights[i] = ratio ** (in_system - 1)
+    p = weights.mean()
+    return {
+        "estimate": p,
+        "relative_error": weights.std(ddof=1) / (p * np.sqrt(num_cycles)) if p > 0 else np.inf,
+        "cpu_seconds": time.process_time() - start,
+        "samples": num_cycles
+    }
+
+
+def main():
+    mean_inter_arrival, mean_service_time, level = 1.0, 0.8, 40
+    exact = overflow_probability(mean_inter_arrival, mean_service_time, level)
+
+    results = [
+        ("Crude Monte Carlo", crude_estimate(mean_inter_arrival, mean_service_time, level, 100_000)),
+        ("Fixed-effort splitting", splitting_estimate(mean_inter_arrival, mean_service_time, level)),
+        ("Importance sampling", importance_sampling_estimate(mean_inter_arrival, mean_service_time, level, 2000)),
+    ]
+
+    # Relative error times sqrt(CPU seconds) is the relative error one CPU-second of work would reach; lower is better
+    rows = [[name, r["samples"], f"{r['estimate']:.4e}", f"{r['relative_error']:.3f}", f"{r['cpu_seconds']:.2f}",
+             f"{r['relative_error'] * np.sqrt(r['cpu_seconds']):.4f}"] for name, r in results]
+    print(f"P({level} customers waiting within a busy cycle), rho = {mean_service_time / mean_inter_arrival:.2f}, "
+          f"exact {exact:.4e}\n")
+    print(tabulate(rows, headers=["Method", "Samples", "Estimate", "Relative Error", "CPU (s)",
+                                  "Relative Error at 1 CPU-s"], tablefmt="grid"))
+
+
+if __name__ == "__main__":
+    main()
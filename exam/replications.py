@@ -0,0 +1,189 @@
+import math
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from statistics import NormalDist
+import numpy as np
+from answer9 import MM1Queue
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, os.pardir, "Monte Carlo"))
+sys.path.append(os.path.join(HERE, os.pardir, "random numbers"))
+from lindley import simulate_mm1
+from variates import substream_seeds
+
+
+def t_cdf(t, df):
+    """Student t CDF for integer df, from the finite series in theta = atan(t / sqrt(df)) (A&S 26.7.3-4)."""
+    theta = math.atan(t / math.sqrt(df))
+    cos2 = math.cos(theta) ** 2
+    if df % 2:
+        term, total = 1.0, 1.0 if df > 1 else 0.0
+        for k in range(2, df - 1, 2):
+            term *= k / (k + 1) * cos2
+            total += term
+        mass = 2 / math.pi * (theta + math.sin(theta) * math.cos(theta) * total)
+    else:
+        term = total = 1.0
+        for k in range(1, df - 2, 2):
+            term *= k / (k + 1) * cos2
+            total += term
+        mass = math.sin(theta) * total
+    return 0.5 + mass / 2
+
+
+def t_quantile(p, df):
+    """
+    Student t quantile.
+
+    The Cornish-Fisher expansion around the normal is within 2e-5 for
+    df >= 30 and p <= 0.995, but off by 3e-3 at df = 5 and by more below,
+    where the stopping rule starts. Small integer df therefore invert the
+    exact CDF by bisection on theta in (-pi/2, pi/2), t = sqrt(df) * tan(theta).
+    """
+    if df < 30 and df == int(df):
+        df = int(df)
+        low, high = -math.pi / 2, math.pi / 2
+        for _ in range(100):
+            mid = (low + high) / 2
+            if t_cdf(math.sqrt(df) * math.tan(mid), df) < p:
+                low = mid
+            else:
+                high = mid
+        return math.sqrt(df) * math.tan((low + high) / 2)
+    z = NormalDist().inv_cdf(p)
+    return (z + (z**3 + z) / (4 * df) + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * df**2)
+            + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * df**3))
+
+
+def mser5_truncation(series, batch_size=5):
+    """
+    Warm-up length chosen by MSER-5.
+
+    The series is averaged in batches of 5 and the deletion point d minimizes
+    the marginal standard error sum((Y_i - mean of Y_{d+1..n})^2) / (n - d)^2,
+    searched over the first half of the batches. Returns the number of
+    observations to delete.
+    """
+    n = len(series) // batch_size
+    y = np.asarray(series[:n * batch_size], dtype=float).reshape(n, batch_size).mean(axis=1)
+    y = y - y.mean()  # Centring keeps the suffix sums of squares accurate
+    count = np.arange(n, 0, -1)
+    suffix_sum = np.cumsum(y[::-1])[::-1]
+    suffix_squares = np.cumsum((y * y)[::-1])[::-1]
+    mser = (suffix_squares - suffix_sum**2 / count) / count**2
+    return int(np.argmin(mser[:n // 2 + 1])) * batch_size
+
+
+def batch_means(series, num_batches=20, confidence=0.95):
+    """Mean of one long run with a confidence half-width from `num_batches` non-overlapping batch means."""
+    size = len(series) // num_batches
+    if num_batches < 2 or size < 1:
+        raise ValueError(f"Need at least 2 batches of at least one observation, got {len(series)} observations "
+                         f"for {num_batches} batches")
+    means = np.asarray(series[len(series) - size * num_batches:], dtype=float).reshape(num_batches, size).mean(axis=1)
+    half_width = t_quantile(0.5 + confidence / 2, num_batches - 1) * means.std(ddof=1) / np.sqrt(num_batches)
+    return float(means.mean()), float(half_width)
+
+
+def event_delays(mean_inter_arrival, mean_service_time, num_customers, seed):
+    # Per-customer delays from the event-scheduled MM1Queue
+    queue = MM1Queue(mean_inter_arrival, mean_service_time, num_customers, seed=seed)
+    queue.run_simulation()
+    starts = queue.customers.service_start_time.values
+    return starts - queue.customers.arrival_time.values[:len(starts)]
+
+
+def lindley_delays(mean_inter_arrival, mean_service_time, num_customers, seed):
+    # Per-customer delays from the Lindley engine behind mm1_queue_simulation_live, collected from its progress events
+    chunks = []
+    simulate_mm1(mean_inter_arrival, mean_service_time, num_customers, chunk_size=min(num_customers, 1_000_000),
+                 seed=seed, on_progress=lambda event: chunks.append(event["waits"]))
+    return np.concatenate(chunks)
+
+
+MODELS = {"event": event_delays, "lindley": lindley_delays}
+
+
+def run_replication(model, mean_inter_arrival, mean_service_time, num_customers, seed, num_batches=20,
+                    confidence=0.95):
+    """One replication: simulate, delete the MSER-5 warm-up and summarize the steady-state delay."""
+    start = time.perf_counter()
+    delays = MODELS[model](mean_inter_arrival, mean_service_time, num_customers, seed)
+    warmup = mser5_truncation(delays)
+    mean, half_width = batch_means(delays[warmup:], num_batches, confidence)
+    return {
+        "seed": seed,
+        "warmup": warmup,
+        "raw_delay": float(delays.mean()),
+        "delay": mean,
+        "batch_half_width": half_width,
+        "elapsed": time.perf_counter() - start
+    }
+
+
+def run_replications(model="lindley", mean_inter_arrival=1.0, mean_service_time=0.8, num_customers=100_000,
+                     target_half_width=0.05, confidence=0.95, min_replications=5, max_replications=200, seed=1,
+                     workers=None, num_batches=20):
+    """
+    Independent replications on a process pool, stopping at the requested CI half-width.
+
+    Replication k seeds its LCG with substream_seeds(seed, max_replications)[k],
+    so the replications are independent. A progress dictionary is yielded
+    as each replication finishes, with the across-replication mean
+    and half-width so far; the run stops (and queued replications are
+    cancelled) once at least min_replications are in and the half-width is
+    at most target_half_width.
+    """
+    seeds = substream_seeds(seed, max_replications).tolist()
+    workers = workers or os.cpu_count()
+    delays = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        def submit(index):
+            return pool.submit(run_replication, model, mean_inter_arrival, mean_service_time, num_customers,
+                               seeds[index], num_batches, confidence)
+
+        submitted = min(workers, max_replications)
+        pending = {submit(index) for index in range(submitted)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                delays.append(result["delay"])
+                n = len(delays)
+                half_width = (t_quantile(0.5 + confidence / 2, n - 1) * np.std(delays, ddof=1) / np.sqrt(n)
+                              if n > 1 else float("inf"))
+                converged = n >= min_replications and half_width <= target_half_width
+                yield dict(result, replications=n, mean_delay=float(np.mean(delays)), half_width=float(half_width),
+                           converged=converged)
+                if converged:
+                    for other in pending:
+                        other.cancel()
+                    return
+                if submitted < max_replications:
+                    pending.add(submit(submitted))
+                    submitted += 1
+
+
+def main():
+    mean_inter_arrival, mean_service_time = 1.0, 0.8
+    rho = mean_service_time / mean_inter_arrival
+    exact = rho * mean_service_time / (1 - rho)
+
+    for model, num_customers in (("lindley", 200_000), ("event", 50_000)):
+        print(f"\n{model} model, {num_customers} customers per replication, M/M/1 delay {exact:.4f}")
+        print(f"{'Rep':>4} {'Seed':>11} {'Warm-up':>8} {'Raw':>8} {'Delay':>8} {'Batch +/-':>10} "
+              f"{'Mean':>8} {'+/-':>8}")
+        for event in run_replications(model, mean_inter_arrival, mean_service_time, num_customers,
+                                      target_half_width=0.05):
+            print(f"{event['replications']:>4} {event['seed']:>11} {event['warmup']:>8} {event['raw_delay']:>8.4f} "
+                  f"{event['delay']:>8.4f} {event['batch_half_width']:>10.4f} {event['mean_delay']:>8.4f} "
+                  f"{event['half_width']:>8.4f}")
+        status = "reached" if event["converged"] else "not reached"
+        print(f"Target half-width 0.05 {status}: {event['mean_delay']:.4f} +/- {event['half_width']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import os
+import shutil
+import stat
+import numpy as np
+import pytest
+from offline_render import PursuitScene, RandomWalkScene, render
+from trajectory_store import TrajectoryStore
+
+
+def make_store(path=None):
+    # Capacity 4 with 10 frames: the ring buffer has wrapped, so slot order differs from recording order
+    store = TrajectoryStore((3, 2), capacity=4, path=path)
+    for step in range(10):
+        store.append(np.full((3, 2), step / 10))
+    return store
+
+
+def test_store_slots_are_oldest_first():
+    store = make_store()
+    assert [store.step_numbers[slot] for slot in store.slots()] == [6, 7, 8, 9]
+    assert all(np.array_equal(store.frames[slot], store[i]) for i, slot in enumerate(store.slots()))
+
+
+def test_pursuit_scene_from_store_keeps_frame_order(tmp_path):
+    for store in (make_store(), make_store(str(tmp_path / "frames.npy"))):
+        scene = PursuitScene.from_store(store)
+        assert list(scene.steps) == [6, 7, 8, 9]
+        assert all(np.array_equal(scene._frames()[i], store[i]) for i in range(len(store)))
+
+
+def test_png_sequence(tmp_path):
+    walk = np.cumsum(np.ones(50))
+    assert render(RandomWalkScene(walk, walk), str(tmp_path), duration=0.2, fps=10, size=(160, 120), workers=1) == 2
+    assert sorted(os.listdir(tmp_path)) == ["frame_000000.png", "frame_000001.png"]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_video(tmp_path):
+    output = str(tmp_path / "walk.mp4")
+    walk = np.cumsum(np.ones(50))
+    assert render(RandomWalkScene(walk, walk), output, duration=0.4, fps=10, size=(160, 120), workers=2) == 4
+    assert os.path.getsize(output) > 0
+
+
+def test_encoder_failure_reports_ffmpeg_errors(tmp_path, monkeypatch):
+    # Stand-in for an ffmpeg that quits at once, before reading a frame
+    fake = tmp_path / "bin" / "ffmpeg"
+    fake.parent.mkdir()
+    fake.write_text("#!/bin/sh\necho \"Unknown encoder 'libx264'\" >&2\nexit 1\n")
+    fake.chmod(fake.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{fake.parent}{os.pathsep}{os.environ['PATH']}")
+
+    walk = np.cumsum(np.ones(50))
+    with pytest.raises(RuntimeError, match="status 1 after 0 of 2 frames.*Unknown encoder 'libx264'"):
+        render(RandomWalkScene(walk, walk), str(tmp_path / "walk.mp4"), duration=0.2, fps=10, size=(800, 600),
+               workers=1)
+
+
+def test_blitted_frame_matches_full_redraw(tmp_path):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib.image import imread
+
+    # The walk ends under the lower-right legend, so a frame drawn in the wrong order would show the path on top
+    x = np.linspace(0, 100, 200)
+    y = -np.linspace(0, 100, 200)
+    scene = RandomWalkScene(x, y, num_frames=2)
+    render(scene, str(tmp_path), duration=0.2, fps=10, size=(400, 300), workers=1)
+    blitted = imread(str(tmp_path / "frame_000001.png"))
+
+    fig = Figure(figsize=(4, 3), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    scene.setup(fig)
+    scene.draw(1)
+    canvas.draw()
+    assert np.array_equal((blitted * 255).round(), np.asarray(canvas.buffer_rgba()))
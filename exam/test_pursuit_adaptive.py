@@ -0,0 +1,19 @@
+import numpy as np
+from pursuit_adaptive import integrate_adaptive, polygon_convergence_time
+
+
+def test_regular_polygon_converges_at_the_exact_time():
+    for n in (3, 4, 8):
+        angles = np.linspace(0, 2*np.pi, n, endpoint=False)
+        result = integrate_adaptive(np.column_stack((np.cos(angles), np.sin(angles))))
+        assert result["converged"]
+        assert abs(result["time"] - polygon_convergence_time(n)) < 1e-4
+
+
+def test_already_converged_start_takes_no_step():
+    steps = []
+    for start in ([[0.0, 0.0], [5e-4, 0.0]], [[0.3, 0.2]]):
+        result = integrate_adaptive(start, on_step=lambda t, y: steps.append(t))
+        assert result["converged"] and result["time"] == 0.0 and result["steps"] == 0
+        assert np.array_equal(result["positions"], start)
+    assert steps == []
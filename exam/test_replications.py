@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+from replications import batch_means, t_quantile
+
+# Two-sided 95% and 99% critical values from a standard t table
+T_TABLE = {1: (12.7062, 63.6567), 2: (4.3027, 9.9248), 3: (3.1824, 5.8409), 4: (2.7764, 4.6041),
+           5: (2.5706, 4.0321), 9: (2.2622, 3.2498), 19: (2.0930, 2.8609), 29: (2.0452, 2.7564),
+           30: (2.0423, 2.7500), 60: (2.0003, 2.6603)}
+
+
+def test_t_quantile_matches_table():
+    for df, (q975, q995) in T_TABLE.items():
+        assert abs(t_quantile(0.975, df) - q975) < 1e-4
+        assert abs(t_quantile(0.995, df) - q995) < 1e-4
+        assert abs(t_quantile(0.025, df) + q975) < 1e-4
+
+
+def test_batch_means_rejects_too_few_observations():
+    with pytest.raises(ValueError):
+        batch_means(np.ones(19), num_batches=20)
+    with pytest.raises(ValueError):
+        batch_means(np.ones(100), num_batches=1)
+    assert batch_means(np.arange(40.0), num_batches=20)[0] == 19.5
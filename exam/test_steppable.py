@@ -0,0 +1,95 @@
+import math
+import warnings
+from functools import partial
+from answer9 import MM1Queue
+from event_kernel import CancellationToken
+from multi_server import GGcQueue, MMcQueue
+
+NUM_CUSTOMERS = 20_000
+
+
+def make_mm1(trace):
+    return MM1Queue(1.0, 0.9, NUM_CUSTOMERS, seed=1, trace=trace)
+
+
+def make_mmc():
+    return MMcQueue(0.25, 3.0, 4, NUM_CUSTOMERS, seed=1)
+
+
+def interrupted_run(make):
+    """Run with every kind of interruption: steps, a snapshot, run_until (also into the past) and a restore."""
+    queue = make()
+    queue.step(12345)
+    now = queue.scheduler.now
+    queue.run_until(100.0)  # Earlier than the clock: nothing happens
+    assert queue.scheduler.now == now
+
+    saved = queue.snapshot()
+    queue.run_until(now + 500.0)
+    queue.calculate_statistics()  # Reading mid-run must not change the outcome
+    queue.step(777)
+
+    resumed = make()
+    resumed.restore(saved)
+    resumed.run_until(now + 250.0)
+    resumed.step(1)
+    resumed.run()
+    return resumed
+
+
+def test_mm1_resumed_run_matches_uninterrupted():
+    for trace in (True, False):
+        reference = make_mm1(trace)
+        reference.run()
+        resumed = interrupted_run(lambda: make_mm1(trace))
+        assert resumed.calculate_statistics() == reference.calculate_statistics()
+        assert resumed.scheduler.events_processed == reference.scheduler.events_processed
+
+
+def test_mmc_resumed_run_matches_uninterrupted():
+    reference = make_mmc()
+    reference.run()
+    resumed = interrupted_run(make_mmc)
+    assert resumed.calculate_statistics() == reference.calculate_statistics()
+    assert resumed.scheduler.events_processed == reference.scheduler.events_processed
+
+
+def test_run_until_in_the_past_keeps_the_clock():
+    queue = make_mm1(trace=False)
+    queue.step(12345)
+    now = queue.scheduler.now
+    queue.run_until(100.0)
+    assert queue.scheduler.now == now == queue.current_time
+    event_id = queue.scheduler.schedule(0.0, 0)
+    assert queue.scheduler.pop()[:2] == (now, event_id)
+
+
+def test_ggc_statistics_after_run_until_cover_the_whole_clock():
+    # Arrivals every 1.0 time units, each served for 0.5: at t = 10.25 customer 10 has been in service for 0.25
+    queue = GGcQueue(1, partial(float, 1.0), partial(float, 0.5), 100)
+    queue.run_until(10.25)
+    stats = queue.calculate_statistics()
+    assert queue.scheduler.now == 10.25
+    assert abs(stats['server_utilization'] - 4.75 / 10.25) < 1e-12
+    assert stats['avg_queue_length'] == 0.0
+
+
+def test_mm1_cancelled_before_anything_is_served():
+    token = CancellationToken()
+    token.cancel()
+    for trace in (True, False):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            stats = make_mm1(trace).run_simulation(cancel=token)
+        assert stats['avg_delay'] == stats['server_utilization'] == stats['simulation_time'] == 0.0
+        assert math.isnan(stats['delay_p50'])
+
+
+def test_mm1_run_until_advances_the_clock_to_the_end_time():
+    traced, online = make_mm1(trace=True), make_mm1(trace=False)
+    for queue in (traced, online):
+        queue.run_until(1000.5)
+        assert queue.current_time == queue.scheduler.now == 1000.5
+    traced_stats, online_stats = traced.calculate_statistics(), online.calculate_statistics()
+    for key in ('avg_delay', 'avg_queue_length', 'server_utilization', 'simulation_time'):
+        assert math.isclose(traced_stats[key], online_stats[key], rel_tol=1e-12)
@@ -0,0 +1,75 @@
+import numpy as np
+
+
+class TrajectoryStore:
+    """
+    Bounded history of simulation frames, such as the (n_entities, 2) positions of each step.
+
+    Frames are copied into one preallocated array of `capacity` slots, so
+    recording allocates nothing. Only every `keep_every`-th frame offered is
+    kept, and once the slots are full the oldest frames are overwritten (a
+    ring buffer), so memory is capacity x frame size however long the run.
+    With `path` the slots live in a memory-mapped .npy file instead of RAM,
+    which suits capacities larger than memory. Frames are stored as float32.
+
+    store[i] is the i-th oldest retained frame, a view into the buffer, and
+    store.step_of(i) the step it was recorded at; store.slots() gives the
+    buffer rows of all retained frames, oldest first.
+    """
+
+    def __init__(self, frame_shape, capacity, keep_every=1, path=None, dtype=np.float32):
+        if capacity < 1 or keep_every < 1:
+            raise ValueError("capacity and keep_every must be positive")
+        shape = (capacity,) + tuple(frame_shape)
+        if path is None:
+            self.frames = np.empty(shape, dtype=dtype)
+        else:
+            self.frames = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+        self.step_numbers = np.empty(capacity, dtype=np.int64)
+        self.capacity = capacity
+        self.keep_every = keep_every
+        self.offered = 0
+        self.stored = 0
+
+    def append(self, frame):
+        """Offer the next frame; it is copied in if decimation keeps it."""
+        if self.offered % self.keep_every == 0:
+            self._store(frame)
+        self.offered += 1
+
+    def finish(self, frame):
+        """Keep `frame`, the last one offered, even if decimation skipped it."""
+        if self.stored == 0 or self.step_numbers[(self.stored - 1) % self.capacity] != self.offered - 1:
+            self.offered -= 1
+            self._store(frame)
+            self.offered += 1
+
+    def _store(self, frame):
+        slot = self.stored % self.capacity
+        self.frames[slot] = frame
+        self.step_numbers[slot] = self.offered
+        self.stored += 1
+
+    def _slot(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError("frame index out of range")
+        i %= len(self)
+        start = self.stored - len(self)
+        return (start + i) % self.capacity
+
+    def slots(self):
+        """Rows of `frames` and `step_numbers` holding the retained frames, oldest first."""
+        return (self.stored - len(self) + np.arange(len(self))) % self.capacity
+
+    def __len__(self):
+        return min(self.stored, self.capacity)
+
+    def __getitem__(self, i):
+        return self.frames[self._slot(i)]
+
+    def step_of(self, i):
+        return int(self.step_numbers[self._slot(i)])
+
+    def flush(self):
+        if isinstance(self.frames, np.memmap):
+            self.frames.flush()
@@ -0,0 +1,296 @@
+import os
+import numpy as np
+
+
+_JUMP_TABLES = {}
+
+
+def _jump_tables(multiplier, increment, modulus, block_size):
+    # Jump-ahead coefficients A_k = a^k mod m and C_k = b * (a^(k-1) + ... + 1) mod m, k = 1..block_size
+    key = (multiplier, increment, modulus, block_size)
+    if key not in _JUMP_TABLES:
+        jump_a = np.empty(block_size, dtype=np.uint64)
+        jump_c = np.empty(block_size, dtype=np.uint64)
+        a_k, c_k = 1, 0
+        for k in range(block_size):
+            a_k, c_k = (a_k * multiplier) % modulus, (c_k * multiplier + increment) % modulus
+            jump_a[k], jump_c[k] = a_k, c_k
+        _JUMP_TABLES[key] = (jump_a, jump_c)
+    return _JUMP_TABLES[key]
+
+
+def skip_ahead(seed, steps, multiplier=1664525, increment=1013904223, modulus=2**32):
+    """
+    State of the recurrence `steps` steps after `seed`, in O(log steps) operations.
+
+    Squaring the affine map r -> a*r + b doubles the jump. Evenly spaced
+    jumps give non-overlapping but strongly correlated substreams for this
+    modulus (see substream_seeds), so do not use them as replication seeds.
+    """
+    jump_a, jump_c = 1, 0
+    a, c = multiplier % modulus, increment % modulus
+    while steps:
+        if steps & 1:
+            jump_a, jump_c = (jump_a * a) % modulus, (jump_c * a + c) % modulus
+        a, c = (a * a) % modulus, (c * (a + 1)) % modulus
+        steps >>= 1
+    return (jump_a * seed + jump_c) % modulus
+
+
+def substream_seeds(seed, count, modulus=2**32):
+    """
+    Seeds of `count` statistically independent streams, hashed from `seed` by numpy's SeedSequence.
+
+    Consecutive outputs of one stream must not be used as seeds: the stream
+    started from r_{k+1} is the stream from r_k shifted by one value. Evenly
+    spaced skip_ahead starts do not help either: with a power-of-two modulus
+    the spacing modulus // count shares the low bits of stream 0, so for
+    count = 4 the streams are stream 0 plus exactly 0.25, 0.5 and 0.75 mod 1
+    (stream 2 has correlation -0.5 with stream 0), so substream spacing
+    cannot give independence with this LCG. Hashed seeds start the streams
+    at unrelated points of the cycle instead; two streams of length L
+    overlap with probability about 2 L / modulus.
+    """
+    states = np.random.SeedSequence(seed).generate_state(count, dtype=np.uint64)
+    return states % np.uint64(modulus)
+
+
+class LCGStream:
+    """
+    Block generator for the linear congruential recurrence r_{i+1} = (a * r_i + b) mod m.
+
+    This is the mixed congruential method of congrence.py (b = 0 gives the
+    multiplicative method) with the parameters of exam/answer10.py as defaults.
+    A whole block is produced at once with the jump-ahead form
+    r_{i+k} = (a^k * r_i + b * (a^(k-1) + ... + 1)) mod m, using uint64
+    arithmetic, so the modulus may be at most 2**32.
+    """
+
+    def __init__(self, seed=None, multiplier=1664525, increment=1013904223, modulus=2**32, block_size=65536):
+        if modulus > 2**32:
+            raise ValueError("Vectorized LCG needs modulus <= 2**32")
+        if seed is None:
+            seed = int.from_bytes(os.urandom(4), "little") % modulus
+        self.seed = seed
+        self.multiplier = multiplier
+        self.increment = increment
+        self.modulus = modulus
+        self.current = seed % modulus
+        self.block_size = block_size
+
+        self._jump_a, self._jump_c = _jump_tables(multiplier, increment, modulus, block_size)
+
+    def __getstate__(self):
+        # Jump tables are rebuilt from the cache when unpickled, so checkpoints stay small
+        state = self.__dict__.copy()
+        del state["_jump_a"], state["_jump_c"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._jump_a, self._jump_c = _jump_tables(self.multiplier, self.increment, self.modulus, self.block_size)
+
+    def integers(self, count):
+        """Next `count` raw values r_1, r_2, ... of the recurrence."""
+        out = np.empty(count, dtype=np.uint64)
+        m = np.uint64(self.modulus)
+        power_of_two = self.modulus & (self.modulus - 1) == 0
+        for start in range(0, count, self.block_size):
+            k = min(self.block_size, count - start)
+            block = self._jump_a[:k] * np.uint64(self.current)
+            if power_of_two:
+                # uint64 products wrap mod 2**64, which a mask reduces to mod m
+                block += self._jump_c[:k]
+                block &= m - np.uint64(1)
+            else:
+                block %= m
+                block += self._jump_c[:k]
+                block %= m
+            out[start:start + k] = block
+            self.current = int(block[-1])
+        return out
+
+    def uniforms(self, count):
+        """Next `count` uniforms in the open interval (0, 1)."""
+        return (self.integers(count) + 0.5) / self.modulus
+
+
+class LCGStreams:
+    """
+    Several LCGStreams with the same parameters, advanced together.
+
+    Row r of every block is exactly what LCGStream(seeds[r]) would return,
+    but all streams are produced by one (streams, block) broadcast instead
+    of a Python loop over the streams.
+    """
+
+    def __init__(self, seeds, multiplier=1664525, increment=1013904223, modulus=2**32, block_size=65536):
+        if modulus > 2**32:
+            raise ValueError("Vectorized LCG needs modulus <= 2**32")
+        self.modulus = modulus
+        self.current = np.asarray(seeds, dtype=np.uint64) % np.uint64(modulus)
+        self.block_size = block_size
+        self._jump_a, self._jump_c = _jump_tables(multiplier, increment, modulus, block_size)
+
+    def integers(self, count):
+        """Next `count` raw values of every stream, shape (streams, count)."""
+        out = np.empty((len(self.current), count), dtype=np.uint64)
+        m = np.uint64(self.modulus)
+        power_of_two = self.modulus & (self.modulus - 1) == 0
+        for start in range(0, count, self.block_size):
+            k = min(self.block_size, count - start)
+            block = out[:, start:start + k]
+            np.multiply(self._jump_a[:k], self.current[:, None], out=block)
+            if power_of_two:
+                block += self._jump_c[:k]
+                block &= m - np.uint64(1)
+            else:
+                block %= m
+                block += self._jump_c[:k]
+                block %= m
+            self.current = block[:, -1].copy()
+        return out
+
+    def uniforms(self, count):
+        """Next `count` uniforms of every stream in the open interval (0, 1), shape (streams, count)."""
+        return (self.integers(count) + 0.5) / self.modulus
+
+
+# Ziggurat tables for the standard normal (Marsaglia & Tsang, 128 layers)
+ZIGGURAT_LAYERS = 128
+ZIGGURAT_R = 3.442619855899
+ZIGGURAT_V = 9.91256303526217e-3
+
+
+def _ziggurat_tables():
+    x = np.empty(ZIGGURAT_LAYERS + 1)
+    x[0] = ZIGGURAT_V / np.exp(-0.5 * ZIGGURAT_R ** 2)  # Width of the base layer including the tail
+    x[1] = ZIGGURAT_R
+    for i in range(1, ZIGGURAT_LAYERS - 1):
+        x[i + 1] = np.sqrt(-2 * np.log(ZIGGURAT_V / x[i] + np.exp(-0.5 * x[i] ** 2)))
+    x[ZIGGURAT_LAYERS] = 0.0
+    return x, np.exp(-0.5 * x ** 2)
+
+
+ZIGGURAT_X, ZIGGURAT_F = _ziggurat_tables()
+# Indexed by sign bit * 128 + layer, so a single lookup gives the signed width and the core ratio
+ZIGGURAT_SIGNED_X = np.concatenate((-ZIGGURAT_X[:-1], ZIGGURAT_X[:-1]))
+ZIGGURAT_CORE = np.tile(ZIGGURAT_X[1:] / ZIGGURAT_X[:-1], 2)
+
+
+def exponential_from_uniforms(u, mean=1.0):
+    """Inverse-CDF exponential variates: -mean * ln(u)."""
+    return -mean * np.log(u)
+
+
+def box_muller(u1, u2):
+    """Two arrays of independent standard normals from two arrays of uniforms."""
+    radius = np.sqrt(-2 * np.log(u1))
+    angle = 2 * np.pi * u2
+    return radius * np.cos(angle), radius * np.sin(angle)
+
+
+def polar(u1, u2):
+    """Marsaglia polar method; returns the normals of the accepted pairs only (about 78.5%)."""
+    v1, v2 = 2 * u1 - 1, 2 * u2 - 1
+    s = v1 * v1 + v2 * v2
+    accept = (s > 0) & (s < 1)
+    v1, v2, s = v1[accept], v2[accept], s[accept]
+    factor = np.sqrt(-2 * np.log(s) / s)
+    return np.concatenate((v1 * factor, v2 * factor))
+
+
+def ziggurat(u_layer, u_x):
+    """
+    Ziggurat normals from two uniform arrays.
+
+    The top bit of u_layer picks the sign and the next seven bits the layer.
+    Returns (values, accepted, layer): positions falling in the rectangle cores
+    are accepted directly (about 98.8% of draws); the rest are left for
+    VariateGenerator to resolve with the wedge and tail tests.
+    """
+    bits = (u_layer * 2 * ZIGGURAT_LAYERS).astype(np.intp)
+    return u_x * ZIGGURAT_SIGNED_X[bits], u_x < ZIGGURAT_CORE[bits], bits % ZIGGURAT_LAYERS
+
+
+class VariateGenerator:
+    """
+    Vectorized normal, exponential and inverse-CDF variates fed by an in-house uniform stream.
+
+    `uniforms` is any callable returning that many uniforms in (0, 1), by default
+    an LCGStream. Uniforms are consumed in blocks, so each call produces
+    millions of variates at NumPy speed. next_exponential() hands out scalars
+    from a buffered block for event-by-event simulations.
+    """
+
+    def __init__(self, uniforms=None, buffer_size=4096):
+        self.uniforms = uniforms if uniforms is not None else LCGStream().uniforms
+        self.buffer_size = buffer_size
+        self._exp_buffer = np.empty(0)
+        self._exp_index = 0
+
+    def exponential(self, size, mean=1.0):
+        return exponential_from_uniforms(self.uniforms(size), mean)
+
+    def next_exponential(self, mean=1.0):
+        if self._exp_index >= len(self._exp_buffer):
+            self._exp_buffer = exponential_from_uniforms(self.uniforms(self.buffer_size)).tolist()
+            self._exp_index = 0
+        value = self._exp_buffer[self._exp_index]
+        self._exp_index += 1
+        return mean * value
+
+    def inverse_cdf(self, size, ppf):
+        """Variates of any distribution from its vectorized inverse CDF (percent point function)."""
+        return ppf(self.uniforms(size))
+
+    def normal(self, size, mean=0.0, std=1.0, method="ziggurat"):
+        if method == "box_muller":
+            half = (size + 1) // 2
+            z = np.concatenate(box_muller(self.uniforms(half), self.uniforms(half)))[:size]
+        elif method == "polar":
+            z = self._fill(size, lambda n: polar(self.uniforms(n // 2 + 1), self.uniforms(n // 2 + 1)), 0.785)
+        elif method == "ziggurat":
+            z = self._fill(size, self._ziggurat_block, 0.99)
+        else:
+            raise ValueError(f"Unknown normal method: {method}")
+        return mean + std * z
+
+    def _fill(self, size, block, acceptance):
+        # Repeat a rejection method until `size` variates have been accepted
+        out = np.empty(size)
+        filled = 0
+        while filled < size:
+            need = size - filled
+            values = block(int(need / acceptance) + 16)[:need]
+            out[filled:filled + len(values)] = values
+            filled += len(values)
+        return out
+
+    def _ziggurat_block(self, n):
+        z, accepted, layer = ziggurat(self.uniforms(n), self.uniforms(n))
+        rejected = np.flatnonzero(~accepted)
+        if len(rejected):
+            z_rej, layer_rej = z[rejected], layer[rejected]
+            keep = np.zeros(len(rejected), dtype=bool)
+
+            # Wedge test for the upper layers
+            wedge = layer_rej > 0
+            x = np.abs(z_rej[wedge])
+            i = layer_rej[wedge]
+            y = ZIGGURAT_F[i] + self.uniforms(len(x)) * (ZIGGURAT_F[i + 1] - ZIGGURAT_F[i])
+            keep[wedge] = y < np.exp(-0.5 * x * x)
+
+            # Base layer beyond r: sample the tail directly, retrying until accepted
+            tail = np.flatnonzero(~wedge)
+            while len(tail):
+                t = -np.log(self.uniforms(len(tail))) / ZIGGURAT_R
+                y = -np.log(self.uniforms(len(tail)))
+                ok = 2 * y > t * t
+                z_rej[tail[ok]] = np.sign(z_rej[tail[ok]]) * (ZIGGURAT_R + t[ok])
+                keep[tail[ok]] = True
+                tail = tail[~ok]
+
+            accepted[rejected] = keep
+            z[rejected] = z_rej
+        return z[accepted]